@@ -27,6 +27,14 @@ class ModuleManager:
         """
         self.character_name = character_name
         self.modules = {}
+        # Registered modules bucketed by module_type and by side, kept in step with
+        # self.modules by register_module(), see modules_of_type() / modules_on_side()
+        self._by_type = {}
+        self._by_side = {}
+        self.clusters = []  # Cluster handles created by the modules, see organize_clusters()
+        # Set once any module registered a cluster, so organize_clusters() only scans
+        # the scene when the registry was never used, not when it has been consumed
+        self._clusters_registered = False
         self.guides_grp = None
         self.joints_grp = None
         self.controls_grp = None
@@ -72,19 +80,79 @@ class ModuleManager:
         Args:
             module (BaseModule): Module instance
         """
+        # Drop a module registered under the same id from the buckets
+        previous = self.modules.get(module.module_id)
+        if previous is not None:
+            self._by_type[previous.module_type].remove(previous)
+            self._by_side[previous.side].remove(previous)
+
         self.modules[module.module_id] = module
+        self._by_type.setdefault(module.module_type, []).append(module)
+        self._by_side.setdefault(module.side, []).append(module)
         module.set_manager(self)
 
-    def create_all_guides(self):
-        """Create guides for all registered modules."""
-        for module_id, module in self.modules.items():
+    def register_clusters(self, *handles):
+        """
+        Record cluster handles for the next organize_clusters() call.
+
+        Args:
+            *handles (str): Cluster handle transforms
+        """
+        self.clusters.extend(handles)
+        self._clusters_registered = True
+
+    def modules_of_type(self, module_type):
+        """
+        Get the registered modules of one type, in registration order.
+
+        Args:
+            module_type (str): Module type, e.g. 'spine', 'arm' or 'leg'
+
+        Returns:
+            list: Module instances
+        """
+        return list(self._by_type.get(module_type, ()))
+
+    def modules_on_side(self, side):
+        """
+        Get the registered modules on one side, in registration order.
+
+        Args:
+            side (str): Side code, 'c', 'l' or 'r'
+
+        Returns:
+            list: Module instances
+        """
+        return list(self._by_side.get(side, ()))
+
+    def create_all_guides(self, progress=None):
+        """
+        Create guides for all registered modules.
+
+        Args:
+            progress (callable): Called with the number of steps done and a label
+                before each module
+        """
+        for index, module in enumerate(self.modules.values()):
+            if progress:
+                progress(index, f"Creating guides for {module.module_id}...")
             module.create_guides()
 
-    def build_all_modules(self):
-        """Build all registered modules."""
-        for module_id, module in self.modules.items():
+    def build_all_modules(self, progress=None):
+        """
+        Build all registered modules.
+
+        Args:
+            progress (callable): Called with the number of steps done and a label
+                before each module and before the final cluster pass
+        """
+        for index, module in enumerate(self.modules.values()):
+            if progress:
+                progress(index, f"Building {module.module_id}...")
             module.build()
 
+        if progress:
+            progress(len(self.modules), "Organizing clusters...")
         self.organize_clusters()
 
     def save_guide_positions(self, file_path):
@@ -127,7 +195,8 @@ class ModuleManager:
         print(f"Setting up IK constraints for mirrored arm: {module.module_id}")
 
         # Verify IK handle exists
-        if "ik_handle" not in module.controls or not cmds.objExists(module.controls["ik_handle"]):
+        ik_handle = module.controls.get("ik_handle")
+        if not ik_handle or not cmds.objExists(ik_handle):
             print("IK handle not found, cannot set up constraints")
             return
 
@@ -140,8 +209,7 @@ class ModuleManager:
             print("Missing required IK joints, cannot set up constraints")
             return
 
-        # Get the IK handle and controls
-        ik_handle = module.controls["ik_handle"]
+        # Get the controls
         wrist_ctrl = module.controls["ik_wrist"]
         pole_ctrl = module.controls["pole"]
 
@@ -181,7 +249,8 @@ class ModuleManager:
         print(f"Setting up IK constraints for mirrored leg: {module.module_id}")
 
         # Verify IK handle and foot roll components exist
-        if "ik_handle" not in module.controls or not cmds.objExists(module.controls["ik_handle"]):
+        ik_handle = module.controls.get("ik_handle")
+        if not ik_handle or not cmds.objExists(ik_handle):
             print("IK handle not found, cannot set up constraints")
             return
 
@@ -190,7 +259,6 @@ class ModuleManager:
             return
 
         # Get the components
-        ik_handle = module.controls["ik_handle"]
         ankle_ctrl = module.controls["ik_ankle"]
         pole_ctrl = module.controls["pole"]
         foot_roll_grp = module.controls["foot_roll_grp"]
@@ -255,8 +323,8 @@ class ModuleManager:
         mirrored_count = 0
 
         # 1. Find all left side modules
-        left_modules = [module for module_id, module in self.modules.items()
-                        if module.side == "l" and module.module_type in ["arm", "leg"]]
+        left_modules = [module for module in self.modules_on_side("l")
+                        if module.module_type in ["arm", "leg"]]
 
         # Bail early if no left modules to mirror
         if not left_modules:
@@ -738,49 +806,57 @@ class ModuleManager:
 
     def organize_clusters(self):
         """
-        Collect and group all cluster handles.
+        Collect and group the cluster handles registered by the modules.
+
+        Falls back to every cluster handle in the scene only when no module has ever
+        registered one, e.g. for guides created before the modules registered their
+        clusters. Once the registry has been used, user clusters are left alone.
 
         Returns:
             int: Number of clusters organized
         """
-        # Find all nodes ending with 'Handle'
-        all_clusters = cmds.ls("*Handle", type="transform")
-
-        # Filter to only include actual cluster handles
-        rig_clusters = []
-        for cluster in all_clusters:
-            # Verify it's a cluster handle
-            if cmds.listRelatives(cluster, shapes=True, type="clusterHandle"):
-                rig_clusters.append(cluster)
+        if self._clusters_registered:
+            # Use the handles the modules registered, dropping any deleted since
+            rig_clusters = cmds.ls(self.clusters) if self.clusters else []
+        else:
+            # Typed lookup of the handle shapes, then their transforms in one call
+            handle_shapes = cmds.ls(type="clusterHandle")
+            rig_clusters = cmds.listRelatives(handle_shapes, parent=True) if handle_shapes else []
+        rig_clusters = list(dict.fromkeys(rig_clusters or []))
 
         # If no clusters found, return
         if not rig_clusters:
             print("No clusters found.")
             return 0
 
+        # Skip handles that already live under the clusters group, found with one
+        # listRelatives call rather than letting cmds.group fail on them
+        clusters_grp_name = f"{self.character_name}_clusters"
+        if cmds.objExists(clusters_grp_name):
+            organized = set(cmds.listRelatives(clusters_grp_name, allDescendents=True, type="transform") or [])
+            rig_clusters = [cluster for cluster in rig_clusters if cluster not in organized]
+            if not rig_clusters:
+                self.clusters = []
+                print("All clusters are already organized.")
+                return 0
+
+        cmds.undoInfo(openChunk=True, chunkName="autorig_organize_clusters")
         try:
-            # Clear selection first
-            cmds.select(clear=True)
-
-            # Select all cluster handles
-            cmds.select(rig_clusters)
-
             # Ensure clusters group exists
-            clusters_grp_name = f"{self.character_name}_clusters"
             if not cmds.objExists(clusters_grp_name):
                 clusters_grp = cmds.group(empty=True, name=clusters_grp_name)
                 cmds.parent(clusters_grp, self.guides_grp)
                 print(f"Created clusters group: {clusters_grp_name}")
 
-            # Create a new subgroup for these clusters
-            grouped_clusters = cmds.group(name=f"{self.character_name}_clusters_{len(rig_clusters)}")
+            # Group every handle in one call, without touching the selection
+            grouped_clusters = cmds.group(rig_clusters, name=f"{self.character_name}_clusters_{len(rig_clusters)}")
             cmds.parent(grouped_clusters, clusters_grp_name)
 
             # Set visibility off
             cmds.setAttr(f"{grouped_clusters}.visibility", 0)
 
-            # Clear selection
-            cmds.select(clear=True)
+            # Grouped handles are not picked up again by the next call
+            self.clusters = []
 
             print(f"Organized {len(rig_clusters)} clusters into {grouped_clusters}")
             return len(rig_clusters)
@@ -788,6 +864,8 @@ class ModuleManager:
         except Exception as e:
             print(f"Error organizing clusters: {e}")
             return 0
+        finally:
+            cmds.undoInfo(closeChunk=True)
 
     def _mirror_controls(self, source_module, target_module):
         """
@@ -814,6 +892,7 @@ class ModuleManager:
 
         # Clear controls dictionary
         target_module.controls = {}
+        target_module.control_groups = {}
 
         # Restore saved IK handles
         for key, value in saved_controls.items():
@@ -986,6 +1065,7 @@ class ModuleManager:
 
             # Store the control
             target_module.controls[target_key] = target_ctrl
+            target_module.control_groups[target_key] = target_grp
             print(f"Created control {target_key}: {target_ctrl}")
             return target_ctrl
 
@@ -1033,6 +1113,7 @@ class ModuleManager:
             # Parent to control group
             cmds.parent(clavicle_grp, target_module.control_grp)
             target_module.controls["clavicle"] = clavicle_ctrl
+            target_module.control_groups["clavicle"] = clavicle_grp
 
             # Connect with constraint
             cmds.parentConstraint(clavicle_ctrl, clavicle_joint, maintainOffset=True)
@@ -1074,6 +1155,7 @@ class ModuleManager:
 
                 # Store for the chain
                 target_module.controls[joint_key] = ctrl
+                target_module.control_groups[joint_key] = ctrl_grp
                 prev_ctrl = ctrl
                 print(f"Created {joint_key} control: {ctrl}")
 
@@ -1098,6 +1180,7 @@ class ModuleManager:
 
             # Store control
             target_module.controls["ik_wrist"] = wrist_ctrl
+            target_module.control_groups["ik_wrist"] = wrist_grp
 
             # Connect IK handle to wrist control if it exists
             if "ik_handle" in target_module.controls:
@@ -1134,6 +1217,7 @@ class ModuleManager:
             # Parent to control group
             cmds.parent(pole_grp, target_module.control_grp)
             target_module.controls["pole"] = pole_ctrl
+            target_module.control_groups["pole"] = pole_grp
 
             # Create pole vector constraint if IK handle exists
             if "ik_handle" in target_module.controls:
@@ -1185,6 +1269,7 @@ class ModuleManager:
 
             # Store control
             target_module.controls["fkik_switch"] = switch_ctrl
+            target_module.control_groups["fkik_switch"] = switch_grp
 
             # Make switch follow the main joint
             cmds.parentConstraint(
@@ -1249,6 +1334,7 @@ class ModuleManager:
 
                 # Store for the chain
                 target_module.controls[joint_key] = ctrl
+                target_module.control_groups[joint_key] = ctrl_grp
                 prev_ctrl = ctrl
                 print(f"Created {joint_key} control: {ctrl}")
             else:
@@ -1295,6 +1381,7 @@ class ModuleManager:
 
             # Store control
             target_module.controls["ik_ankle"] = ankle_ctrl
+            target_module.control_groups["ik_ankle"] = ankle_grp
 
             # Add foot attributes
             for attr_name in ["roll", "tilt", "toe", "heel"]:
@@ -1333,6 +1420,7 @@ class ModuleManager:
             # Parent to control group
             cmds.parent(pole_grp, target_module.control_grp)
             target_module.controls["pole"] = pole_ctrl
+            target_module.control_groups["pole"] = pole_grp
 
             # Create pole vector constraint
             if "ik_handle" in target_module.controls:
@@ -1388,6 +1476,7 @@ class ModuleManager:
 
             # Store control
             target_module.controls["fkik_switch"] = switch_ctrl
+            target_module.control_groups["fkik_switch"] = switch_grp
 
             # Make switch follow the main joint
             cmds.parentConstraint(
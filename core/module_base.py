@@ -40,6 +40,7 @@ class BaseModule(ABC):
         self.blade_guides = {}  # Specialized guides for orientation
         self.joints = {}
         self.controls = {}
+        self.control_groups = {}  # Offset group names by control key, see get_control_group()
         self.utility_nodes = {}  # Store utility nodes created for this module
 
         # Group references
@@ -68,6 +69,30 @@ class BaseModule(ABC):
         """
         self.manager = manager
 
+    def register_clusters(self, *handles):
+        """
+        Record cluster handles with the manager so organize_clusters can find them.
+
+        Args:
+            *handles (str): Cluster handle transforms created by this module
+        """
+        if self.manager:
+            self.manager.register_clusters(*handles)
+
+    def get_control_group(self, key):
+        """
+        Get the name of the offset group put above a control.
+
+        The modules record the group in self.control_groups when they create it.
+
+        Args:
+            key (str): Control key in self.controls
+
+        Returns:
+            str: Group name, or None if the module has no such control
+        """
+        return self.control_groups.get(key)
+
     def _create_module_groups(self):
         """Create the module groups."""
         if not self.manager:
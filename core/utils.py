@@ -10,6 +10,8 @@ Date: 2025
 """
 
 import maya.cmds as cmds
+import maya.api.OpenMaya as om
+import contextlib
 import math
 
 # Constants
@@ -387,4 +389,19 @@ def unlock_and_show_attributes(node, attributes=None):
 
     for attr in attributes:
         if cmds.attributeQuery(attr, node=node, exists=True):
-            cmds.setAttr(f"{node}.{attr}", lock=False, keyable=True)
\ No newline at end of file
+            cmds.setAttr(f"{node}.{attr}", lock=False, keyable=True)
+
+
+@contextlib.contextmanager
+def maintained_selection():
+    """
+    Restore the active selection after the wrapped block, using the API selection list.
+
+    The selection is restored with one MGlobal call rather than a cmds.select per
+    node, and the restore itself is not recorded on the undo queue.
+    """
+    selection = om.MGlobal.getActiveSelectionList()
+    try:
+        yield
+    finally:
+        om.MGlobal.setActiveSelectionList(selection)
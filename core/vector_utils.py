@@ -371,4 +371,29 @@ def create_rotation_matrix(aim_vector, up_vector):
         0, 0, 0, 1
     ]
 
-    return matrix
\ No newline at end of file
+    return matrix
+
+def get_world_positions(nodes):
+    """
+    Get the world space translation of several transforms in one API pass.
+
+    Equivalent to calling cmds.xform(node, q=True, t=True, ws=True) on each
+    node, without a separate command round-trip per node.
+
+    Args:
+        nodes (list): Transform or joint names
+
+    Returns:
+        list: [x, y, z] positions in the same order as nodes
+    """
+    # Resolve one node at a time: MSelectionList.add merges a node that is already
+    # in the list, which would shorten the result and shift every later position
+    sel = om.MSelectionList()
+    positions = []
+    for node in nodes:
+        sel.clear()
+        sel.add(node)
+        translation = om.MFnTransform(sel.getDagPath(0)).translation(om.MSpace.kWorld)
+        positions.append([translation.x, translation.y, translation.z])
+
+    return positions
@@ -96,6 +96,7 @@ class HeadModule(BaseModule):
             # Hide clusters
             cmds.setAttr(f"{cls1}.visibility", 0)
             cmds.setAttr(f"{cls2}.visibility", 0)
+            self.register_clusters(cls1, cls2)
 
     def build(self):
         """Build the head rig."""
@@ -445,6 +446,7 @@ class HeadModule(BaseModule):
 
         # Clear controls dictionary
         self.controls = {}
+        self.control_groups = {}
 
     def _create_head_control(self):
         """Create the head control."""
@@ -473,6 +475,7 @@ class HeadModule(BaseModule):
 
         # Store reference
         self.controls["head"] = ctrl
+        self.control_groups["head"] = ctrl_grp
 
     def _setup_constraints(self):
         """Set up constraints between controls and joints."""
@@ -18,7 +18,8 @@ from autorig.core.joint_utils import (is_planar_chain, make_planar, create_orien
                                      fix_specific_joint_orientation)
 from autorig.core.vector_utils import (vector_from_two_points, vector_length, normalize_vector,
                                      dot_product, cross_product, scale_vector, add_vectors,
-                                     subtract_vectors, get_midpoint, angle_between_vectors_deg)
+                                     subtract_vectors, get_midpoint, angle_between_vectors_deg,
+                                     get_world_positions)
 
 
 class LimbModule(BaseModule):
@@ -180,9 +181,11 @@ class LimbModule(BaseModule):
                 # Create position constraints so the curve follows the guides
                 cls = cmds.cluster(f"{curve}.cv[0]")[1]
                 cmds.pointConstraint(self.guides[start], cls)
+                self.register_clusters(cls)
 
                 cls = cmds.cluster(f"{curve}.cv[1]")[1]
                 cmds.pointConstraint(self.blade_guides[end], cls)
+                self.register_clusters(cls)
 
                 # Hide clusters
                 cmds.setAttr(f"{cls}.visibility", 0)
@@ -385,7 +388,7 @@ class LimbModule(BaseModule):
                         try:
                             cmds.rename(old_name, new_name)
                             print(f"Renamed FK joint: {old_name} -> {new_name}")
-                        except:
+                        except RuntimeError:
                             print(f"Failed to rename {old_name} to {new_name}")
 
                     # Store in dictionary
@@ -1293,10 +1296,9 @@ class LimbModule(BaseModule):
         )
 
         # Get position data for reverse foot setup
-        ankle_pos = cmds.xform(self.joints["ik_ankle"], query=True, translation=True, worldSpace=True)
-        foot_pos = cmds.xform(self.joints["ik_foot"], query=True, translation=True, worldSpace=True)
-        toe_pos = cmds.xform(self.joints["ik_toe"], query=True, translation=True, worldSpace=True)
-        heel_pos = cmds.xform(self.guides["heel"], query=True, translation=True, worldSpace=True)
+        ankle_pos, foot_pos, toe_pos, heel_pos = get_world_positions([
+            self.joints["ik_ankle"], self.joints["ik_foot"], self.joints["ik_toe"], self.guides["heel"]
+        ])
 
         # First, create a main foot roll group to contain everything
         foot_roll_grp = cmds.group(empty=True, name=foot_roll_grp_name)
@@ -1373,6 +1375,7 @@ class LimbModule(BaseModule):
         # Store IK handle for later use
         ik_handle = self.controls.get("ik_handle", None)
         self.controls = {}
+        self.control_groups = {}
         if ik_handle:
             self.controls["ik_handle"] = ik_handle
 
@@ -1456,6 +1459,7 @@ class LimbModule(BaseModule):
             cmds.parent(ctrl_grp, self.control_grp)
 
         self.controls[control_key] = ctrl
+        self.control_groups[control_key] = ctrl_grp
         return ctrl, ctrl_grp
 
     def _create_arm_ik_controls(self):
@@ -1480,6 +1484,7 @@ class LimbModule(BaseModule):
         cmds.delete(temp_constraint)
         cmds.parent(wrist_ik_grp, self.control_grp)
         self.controls["ik_wrist"] = wrist_ik_ctrl
+        self.control_groups["ik_wrist"] = wrist_ik_grp
 
         # 2. Parent IK handle to wrist control
         if "ik_handle" in self.controls and cmds.objExists(self.controls["ik_handle"]):
@@ -1502,6 +1507,7 @@ class LimbModule(BaseModule):
 
         cmds.parent(pole_grp, self.control_grp)
         self.controls["pole"] = pole_ctrl
+        self.control_groups["pole"] = pole_grp
 
         # Important: Move pole control back in Z BEFORE constraints
         print(f"Moving pole control back in -Z direction")
@@ -1514,16 +1520,14 @@ class LimbModule(BaseModule):
         print(f"Froze transformations on pole vector control")
 
         # 5. Create pole vector constraint AFTER freezing transforms
-        if "ik_handle" in self.controls and cmds.objExists(self.controls["ik_handle"]):
-            print(f"Creating pole vector constraint from {pole_ctrl} to {self.controls['ik_handle']}")
-            cmds.poleVectorConstraint(pole_ctrl, self.controls["ik_handle"], weight=1)
+        ik_handle = self.controls.get("ik_handle")
+        if ik_handle and cmds.objExists(ik_handle):
+            print(f"Creating pole vector constraint from {pole_ctrl} to {ik_handle}")
+            cmds.poleVectorConstraint(pole_ctrl, ik_handle, weight=1)
 
-        # 7. Zero out the ikHandle's poleVector attributes
-        if "ik_handle" in self.controls and cmds.objExists(self.controls["ik_handle"]):
-            print(f"Zeroing out poleVector attributes on {self.controls['ik_handle']}")
-            cmds.setAttr(f"{self.controls['ik_handle']}.poleVectorX", 0)
-            cmds.setAttr(f"{self.controls['ik_handle']}.poleVectorY", 0)
-            cmds.setAttr(f"{self.controls['ik_handle']}.poleVectorZ", 0)
+            # 7. Zero out the ikHandle's poleVector attributes
+            print(f"Zeroing out poleVector attributes on {ik_handle}")
+            cmds.setAttr(f"{ik_handle}.poleVector", 0, 0, 0, type="double3")
 
         # Orient constraint for IK wrist to maintain orientation
         cmds.orientConstraint(wrist_ik_ctrl, wrist_ik_jnt, maintainOffset=True)
@@ -1566,6 +1570,7 @@ class LimbModule(BaseModule):
         ankle_pivot = self.controls.get("ankle_pivot", None)
 
         self.controls = {}
+        self.control_groups = {}
 
         # Restore IK handles
         if ik_handle:
@@ -1636,6 +1641,7 @@ class LimbModule(BaseModule):
 
         cmds.parent(ankle_ik_grp, self.control_grp)
         self.controls["ik_ankle"] = ankle_ik_ctrl
+        self.control_groups["ik_ankle"] = ankle_ik_grp
 
         # IMPORTANT: Connect the ankle IK control to the foot roll group
         if "foot_roll_grp" in self.controls and cmds.objExists(self.controls["foot_roll_grp"]):
@@ -1836,6 +1842,7 @@ class LimbModule(BaseModule):
 
         # Store the switch control
         self.controls["fkik_switch"] = switch_ctrl
+        self.control_groups["fkik_switch"] = switch_grp
 
         # Make the switch follow the main binding joint
         # First, check if there are any existing constraints and delete them
@@ -2102,6 +2109,7 @@ class LimbModule(BaseModule):
         # Store reference to the curve
         self.utility_nodes["pole_viz_curve"] = curve
         self.utility_nodes["pole_viz_clusters"] = clusters
+        self.register_clusters(*clusters)
 
         return curve
 
@@ -2258,21 +2266,16 @@ class LimbModule(BaseModule):
         This is a helper method for match_ik_to_fk.
         """
         if self.limb_type == "arm":
-            if not all(j in self.joints for j in ["shoulder", "elbow", "wrist"]):
+            chain = ["shoulder", "elbow", "wrist"]
+            if not all(j in self.joints for j in chain):
                 return
-
-            # Get joint positions from the binding joints (which have the FK pose)
-            shoulder_pos = cmds.xform(self.joints["shoulder"], q=True, ws=True, t=True)
-            elbow_pos = cmds.xform(self.joints["elbow"], q=True, ws=True, t=True)
-            wrist_pos = cmds.xform(self.joints["wrist"], q=True, ws=True, t=True)
         else:  # leg
-            if not all(j in self.joints for j in ["hip", "knee", "ankle"]):
+            chain = ["hip", "knee", "ankle"]
+            if not all(j in self.joints for j in chain):
                 return
 
-            # Get joint positions from the binding joints (which have the FK pose)
-            shoulder_pos = cmds.xform(self.joints["hip"], q=True, ws=True, t=True)
-            elbow_pos = cmds.xform(self.joints["knee"], q=True, ws=True, t=True)
-            wrist_pos = cmds.xform(self.joints["ankle"], q=True, ws=True, t=True)
+        # Get joint positions from the binding joints (which have the FK pose)
+        shoulder_pos, elbow_pos, wrist_pos = get_world_positions([self.joints[j] for j in chain])
 
         # Calculate vectors using our utility functions (no numpy)
         # First calculate vectors
@@ -2395,6 +2398,7 @@ class LimbModule(BaseModule):
         # 3. Parent pole control to control group
         cmds.parent(pole_grp, self.control_grp)
         self.controls["pole"] = pole_ctrl
+        self.control_groups["pole"] = pole_grp
 
         # Important: Move pole control up in Y BEFORE constraints
         print(f"Moving pole control up in Y direction")
@@ -2407,16 +2411,14 @@ class LimbModule(BaseModule):
         print(f"Froze transformations on pole vector control")
 
         # 4. Create pole vector constraint AFTER freezing transforms
-        if "ik_handle" in self.controls and cmds.objExists(self.controls["ik_handle"]):
-            print(f"Creating pole vector constraint from {pole_ctrl} to {self.controls['ik_handle']}")
-            cmds.poleVectorConstraint(pole_ctrl, self.controls["ik_handle"], weight=1)
+        ik_handle = self.controls.get("ik_handle")
+        if ik_handle and cmds.objExists(ik_handle):
+            print(f"Creating pole vector constraint from {pole_ctrl} to {ik_handle}")
+            cmds.poleVectorConstraint(pole_ctrl, ik_handle, weight=1)
 
-        # 6. Zero out the ikHandle's poleVector attributes
-        if "ik_handle" in self.controls and cmds.objExists(self.controls["ik_handle"]):
-            print(f"Zeroing out poleVector attributes on {self.controls['ik_handle']}")
-            cmds.setAttr(f"{self.controls['ik_handle']}.poleVectorX", 0)
-            cmds.setAttr(f"{self.controls['ik_handle']}.poleVectorY", 0)
-            cmds.setAttr(f"{self.controls['ik_handle']}.poleVectorZ", 0)
+            # 6. Zero out the ikHandle's poleVector attributes
+            print(f"Zeroing out poleVector attributes on {ik_handle}")
+            cmds.setAttr(f"{ik_handle}.poleVector", 0, 0, 0, type="double3")
 
         print("Leg pole vector setup complete")
         return pole_ctrl
@@ -2480,6 +2482,7 @@ class LimbModule(BaseModule):
 
         # Store reference and parent to control group
         self.controls["clavicle"] = circle
+        self.control_groups["clavicle"] = circle_grp
         cmds.parent(circle_grp, self.control_grp)
 
         # Connect control to joint
@@ -2587,6 +2590,7 @@ class LimbModule(BaseModule):
         # Store reference to the curve
         self.utility_nodes["pole_viz_curve"] = curve
         self.utility_nodes["pole_viz_clusters"] = clusters
+        self.register_clusters(*clusters)
 
         # Connect curve visibility to IK/FK switch (visible only in IK mode)
         if "fkik_switch" in self.controls:
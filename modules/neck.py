@@ -131,6 +131,7 @@ class NeckModule(BaseModule):
                 # Hide clusters
                 cmds.setAttr(f"{cls1}.visibility", 0)
                 cmds.setAttr(f"{cls2}.visibility", 0)
+                self.register_clusters(cls1, cls2)
 
     def build(self):
         """Build the neck rig."""
@@ -390,6 +391,7 @@ class NeckModule(BaseModule):
 
         # Clear controls dictionary
         self.controls = {}
+        self.control_groups = {}
 
     def _create_neck_base_control(self):
         """Create the neck base control."""
@@ -418,6 +420,7 @@ class NeckModule(BaseModule):
 
         # Store reference
         self.controls["neck_base"] = ctrl
+        self.control_groups["neck_base"] = ctrl_grp
 
     def _create_mid_neck_control(self, mid_neck_name, index):
         """Create a mid-neck control for more flexible control."""
@@ -449,6 +452,7 @@ class NeckModule(BaseModule):
 
         # Store reference
         self.controls["mid_neck"] = ctrl
+        self.control_groups["mid_neck"] = ctrl_grp
 
     def _create_top_neck_control(self):
         """Create a control for the top of the neck."""
@@ -485,6 +489,7 @@ class NeckModule(BaseModule):
 
         # Store reference
         self.controls["top_neck"] = ctrl
+        self.control_groups["top_neck"] = ctrl_grp
 
     def _setup_constraints(self):
         """Set up constraints between controls and joints."""
@@ -136,9 +136,11 @@ class SpineModule(BaseModule):
                 # Create position constraints so the curve follows the guides
                 cls = cmds.cluster(f"{curve}.cv[0]")[1]
                 cmds.pointConstraint(self.guides[start], cls)
+                self.register_clusters(cls)
 
                 cls = cmds.cluster(f"{curve}.cv[1]")[1]
                 cmds.pointConstraint(self.blade_guides[end], cls)
+                self.register_clusters(cls)
 
                 # Hide clusters
                 cmds.setAttr(f"{cls}.visibility", 0)
@@ -413,6 +415,7 @@ class SpineModule(BaseModule):
 
         # Clear controls dictionary
         self.controls = {}
+        self.control_groups = {}
 
     def _create_cog_control(self):
         """Create the COG (root) control with square shape."""
@@ -433,6 +436,7 @@ class SpineModule(BaseModule):
 
         # Store in controls dictionary
         self.controls["cog"] = cog_ctrl
+        self.control_groups["cog"] = cog_grp
 
     def _create_spine_control(self, spine_name, index, parent_to_cog=False):
         """Create a control for a spine joint."""
@@ -471,6 +475,7 @@ class SpineModule(BaseModule):
 
         # Store in controls dictionary
         self.controls[spine_name] = spine_ctrl
+        self.control_groups[spine_name] = spine_grp
 
     def _create_chest_control(self):
         """Create the chest control."""
@@ -498,6 +503,7 @@ class SpineModule(BaseModule):
 
         # Store in controls dictionary
         self.controls["chest"] = chest_ctrl
+        self.control_groups["chest"] = chest_grp
 
     def _setup_spine_constraints(self):
         """Set up constraints between spine controls and joints."""
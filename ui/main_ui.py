@@ -9,23 +9,99 @@ Date: 2025
 """
 
 import maya.cmds as cmds
+import maya.api.OpenMaya as om
 import sys
+import functools
+import contextlib
+import logging
+import re
 from PySide2 import QtWidgets, QtCore, QtGui
 import maya.OpenMayaUI as omui
 import shiboken2
 
 from autorig.core.manager import ModuleManager
-from autorig.core.utils import CONTROL_COLORS
+from autorig.core.utils import maintained_selection
 from autorig.modules.spine import SpineModule
 from autorig.modules.limb import LimbModule
 from autorig.modules.neck import NeckModule
 from autorig.modules.head import HeadModule
 
+log = logging.getLogger("autorig.ui")
+
+# Dialog created by the last show_ui() call
+_CURRENT_DIALOG = None
+
+# Wrapped Maya main window, resolved on first use by maya_main_window()
+_MAIN_WINDOW = None
+
+# Maps the side combo box text to the side code used in module ids
+_SIDE_CODE = {"Center": "c", "Left": "l", "Right": "r"}
+
+# (chain prefix, root joint key) of the IK/FK chains moved under the rig systems group
+_LEG_CHAIN_ROOTS = (("ik_", "ik_hip"), ("fk_", "fk_hip"))
+_ARM_CHAIN_ROOTS = (("ik_", "ik_shoulder"), ("fk_", "fk_shoulder"))
+
+# Name fragments of Maya's own transforms that cleanup must never delete,
+# compiled into one pattern so each name is tested with a single search
+_RESERVED_NULL_RE = re.compile("persp|top|front|side|defaultLayer|LayerManager")
+
+# Batch size used by cleanup when deleting every empty null in one call fails
+_DELETE_CHUNK_SIZE = 64
+
+# Dialog-level stylesheet, widgets are matched by objectName
+_DIALOG_STYLESHEET = """
+QLabel#SettingsHeader { font-weight: bold; margin-top: 10px; }
+QPushButton#MirrorModulesButton { background-color: #E6A8D7; font-weight: bold; }
+QPushButton#BuildRigButton { background-color: #4CAF50; color: white; font-weight: bold; }
+QPushButton#AddRootButton { background-color: #FFA500; color: white; font-weight: bold; }
+QPushButton#CleanupButton { background-color: #FFC300; color: black; font-weight: bold; }
+"""
+
+
+def _requires_manager(need_modules=True):
+    """
+    Decorate a ModularRigUI slot so it only runs once the rig is initialized.
+
+    Args:
+        need_modules (bool): Also require at least one registered module
+
+    Returns:
+        function: Decorator that shows the matching guard dialog, or logs it for
+            interactive=False calls, and returns early
+    """
+    def decorator(func):
+        # Keyword arguments only: a positional signature would let clicked(bool)
+        # deliver its checked state as the first parameter of the slot, so the
+        # decorated slots take their options (e.g. interactive) keyword-only
+        @functools.wraps(func)
+        def wrapper(self, **kwargs):
+            # Scripted callers (interactive=False) get the guard message in the log
+            interactive = kwargs.get("interactive", True)
+            if self.manager is None:
+                if interactive:
+                    self._warn_no_init.open()
+                else:
+                    log.warning(self._warn_no_init.text())
+                return None
+            if need_modules and not self.manager.modules:
+                if interactive:
+                    self._warn_no_modules.open()
+                else:
+                    log.warning(self._warn_no_modules.text())
+                return None
+            return func(self, **kwargs)
+        return wrapper
+    return decorator
+
 
 def maya_main_window():
     """Return the Maya main window widget"""
-    main_window = omui.MQtUtil.mainWindow()
-    return shiboken2.wrapInstance(int(main_window), QtWidgets.QWidget)
+    global _MAIN_WINDOW
+
+    if _MAIN_WINDOW is None or not shiboken2.isValid(_MAIN_WINDOW):
+        main_window = omui.MQtUtil.mainWindow()
+        _MAIN_WINDOW = shiboken2.wrapInstance(int(main_window), QtWidgets.QWidget)
+    return _MAIN_WINDOW
 
 
 class ModularRigUI(QtWidgets.QDialog):
@@ -33,26 +109,78 @@ class ModularRigUI(QtWidgets.QDialog):
     UI for the Modular Rig Systemging system.
     """
 
-    def __init__(self, parent=maya_main_window()):
+    def __init__(self, parent=None):
+        if parent is None:
+            parent = maya_main_window()
         super(ModularRigUI, self).__init__(parent)
 
         self.setWindowTitle("Modular Rig System")
         self.setMinimumWidth(400)
         self.setWindowFlags(self.windowFlags() ^ QtCore.Qt.WindowContextHelpButtonHint)
+        # closeEvent disconnects every signal, so a closed dialog must not be shown again
+        self.setAttribute(QtCore.Qt.WA_DeleteOnClose)
 
         self.manager = None
+
+        # Reusable guard dialogs shown by the slots when the rig is not ready
+        self._warn_no_init = QtWidgets.QMessageBox(
+            QtWidgets.QMessageBox.Warning, "Warning", "Please initialize the rig first.",
+            QtWidgets.QMessageBox.Ok, self
+        )
+        self._warn_no_modules = QtWidgets.QMessageBox(
+            QtWidgets.QMessageBox.Warning, "Warning", "No modules added yet.",
+            QtWidgets.QMessageBox.Ok, self
+        )
+        # Reusable result dialogs, see _warn() and _info()
+        self._warn_box = QtWidgets.QMessageBox(
+            QtWidgets.QMessageBox.Warning, "Warning", "", QtWidgets.QMessageBox.Ok, self
+        )
+        self._info_box = QtWidgets.QMessageBox(
+            QtWidgets.QMessageBox.Information, "Success", "", QtWidgets.QMessageBox.Ok, self
+        )
+        # Reusable confirmation dialog, see _ask()
+        self._ask_box = QtWidgets.QMessageBox(
+            QtWidgets.QMessageBox.Question, "", "",
+            QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No, self
+        )
+        self._ask_on_yes = None
+        self._ask_box.finished.connect(self._on_ask_finished)
+
+        # Module panels are only built once the rig is initialized
+        self._module_ui_built = False
+        # Module settings pages by name, each built on first use by _settings_page()
+        self._settings_pages = {}
+
         self.create_widgets()
         self.create_layouts()
         self.create_connections()
 
+        # Module type -> constructor, built once so add_module is a single lookup
+        self._module_factory = {
+            "Spine": lambda side, name: SpineModule(side, name, self.spine_joints_spinner.value()),
+            "Arm": lambda side, name: LimbModule(side, name, self.limb_type_combo.currentText().lower()),
+            "Leg": lambda side, name: LimbModule(side, name, self.limb_type_combo.currentText().lower()),
+            "Neck": lambda side, name: NeckModule(side, name, self.neck_joints_spinner.value()),
+            "Head": lambda side, name: HeadModule(side, name),
+        }
+
     def create_widgets(self):
-        """Create the UI widgets."""
+        """Create the UI widgets that are shown before the rig is initialized."""
         # Character Settings section
         self.character_name_label = QtWidgets.QLabel("Character Name:")
         self.character_name_field = QtWidgets.QLineEdit("character")
 
         self.init_button = QtWidgets.QPushButton("Initialize Rig")
 
+        # Non-blocking feedback for the build flow, see _show_status()
+        self.status_bar = QtWidgets.QStatusBar()
+        self.status_bar.setSizeGripEnabled(False)
+
+        # Apply all widget styling in one pass so Qt parses the stylesheet once
+        self.setStyleSheet(_DIALOG_STYLESHEET)
+
+    def _create_module_widgets(self):
+        """Create the module, module list and build widgets."""
         # Module Management section
         self.module_type_label = QtWidgets.QLabel("Module Type:")
         self.module_type_combo = QtWidgets.QComboBox()
@@ -65,97 +193,185 @@ class ModularRigUI(QtWidgets.QDialog):
         self.module_name_label = QtWidgets.QLabel("Name:")
         self.module_name_field = QtWidgets.QLineEdit()
 
+        # Single-shot timer so a burst of combo changes updates the name once
+        self._name_update_timer = QtCore.QTimer(self)
+        self._name_update_timer.setSingleShot(True)
+        self._name_update_timer.setInterval(0)
+
         self.add_module_button = QtWidgets.QPushButton("Add Module")
         self.add_module_button.setEnabled(False)  # Disabled until rig is initialized
 
         self.mirror_modules_button = QtWidgets.QPushButton("Mirror Modules")
         self.mirror_modules_button.setEnabled(False)  # Disabled until rig is initialized
-        self.mirror_modules_button.setStyleSheet("background-color: #E6A8D7; font-weight: bold;")
+        self.mirror_modules_button.setObjectName("MirrorModulesButton")
 
         # Module Settings section
         self.settings_label = QtWidgets.QLabel("Module Settings")
-        self.settings_label.setStyleSheet("font-weight: bold; margin-top: 10px;")
+        self.settings_label.setObjectName("SettingsHeader")
+
+        # Stacked widget to switch between module settings, the pages are
+        # added by _settings_page() the first time their module type is picked
+        self.settings_stack = QtWidgets.QStackedWidget()
+
+        # Module List section
+        self.module_list_label = QtWidgets.QLabel("Added Modules:")
+        self._module_model = QtCore.QStringListModel(self)
+        self.module_list = QtWidgets.QListView()
+        self.module_list.setModel(self._module_model)
+        self.module_list.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+
+        # Guide and Build Controls section
+        self.create_guides_button = QtWidgets.QPushButton("Create All Guides")
+        self.create_guides_button.setEnabled(False)
+
+        self.save_guides_button = QtWidgets.QPushButton("Save Guide Positions")
+        self.save_guides_button.setEnabled(False)
+
+        self.load_guides_button = QtWidgets.QPushButton("Load Guide Positions")
+        self.load_guides_button.setEnabled(False)
+
+        self.build_rig_button = QtWidgets.QPushButton("BUILD RIG")
+        self.build_rig_button.setEnabled(False)
+        self.build_rig_button.setObjectName("BuildRigButton")
+
+        self.add_root_button = QtWidgets.QPushButton("Add Root Joint")
+        self.add_root_button.setEnabled(False)
+        self.add_root_button.setObjectName("AddRootButton")
+
+        # Add Cleanup button in the build controls section
+        self.cleanup_button = QtWidgets.QPushButton("Cleanup Scene")
+        self.cleanup_button.setObjectName("CleanupButton")
+        self.cleanup_button.setEnabled(False)  # Initially disabled until rig is initialized
+
+        # Cleanup records its deletes for undo unless this is turned off
+        self.cleanup_undo_checkbox = QtWidgets.QCheckBox("Undoable")
+        self.cleanup_undo_checkbox.setChecked(True)
+        self.cleanup_undo_checkbox.setToolTip(
+            "Record the cleanup for undo. Turn off for faster deletes in large scenes."
+        )
+
+        # Buttons that stay disabled until the rig is initialized
+        self._gated_buttons = (
+            self.add_module_button,
+            self.create_guides_button,
+            self.save_guides_button,
+            self.load_guides_button,
+            self.build_rig_button,
+            self.mirror_modules_button,
+            self.add_root_button,
+            self.cleanup_button,
+        )
 
-        # Spine settings
-        self.spine_settings_widget = QtWidgets.QWidget()
+        # Shared file dialog for saving/loading guide positions
+        self._file_dialog = QtWidgets.QFileDialog(self, "", "", "JSON Files (*.json)")
+        self._file_dialog.setOption(QtWidgets.QFileDialog.DontUseNativeDialog, True)
+        self._file_dialog.setDefaultSuffix("json")
+
+    def _settings_page(self, name):
+        """
+        Return a module settings page, building it and adding it to the stack on first use.
+
+        Args:
+            name (str): Page name, one of 'spine', 'limb', 'neck' or 'head'
+
+        Returns:
+            QtWidgets.QWidget: Settings page
+        """
+        page = self._settings_pages.get(name)
+        if page is None:
+            builders = {
+                "spine": self._build_spine_settings,
+                "limb": self._build_limb_settings,
+                "neck": self._build_neck_settings,
+                "head": self._build_head_settings,
+            }
+            page = builders[name]()
+            self._settings_pages[name] = page
+            self.settings_stack.addWidget(page)
+        return page
+
+    def _build_spine_settings(self):
+        """
+        Create the spine settings page.
+
+        Returns:
+            QtWidgets.QWidget: Spine settings widget
+        """
+        spine_settings_widget = QtWidgets.QWidget()
         self.spine_joints_label = QtWidgets.QLabel("Number of Joints:")
         self.spine_joints_spinner = QtWidgets.QSpinBox()
         self.spine_joints_spinner.setRange(3, 10)
         self.spine_joints_spinner.setValue(5)
 
         spine_settings_layout = QtWidgets.QHBoxLayout()
+        spine_settings_layout.setContentsMargins(0, 0, 0, 0)
         spine_settings_layout.addWidget(self.spine_joints_label)
         spine_settings_layout.addWidget(self.spine_joints_spinner)
-        self.spine_settings_widget.setLayout(spine_settings_layout)
+        spine_settings_widget.setLayout(spine_settings_layout)
 
-        # Limb settings
-        self.limb_settings_widget = QtWidgets.QWidget()
-        self.limb_type_label = QtWidgets.QLabel("Limb Type:")
-        self.limb_type_combo = QtWidgets.QComboBox()
-        self.limb_type_combo.addItems(["Arm", "Leg"])
+        return spine_settings_widget
 
-        limb_settings_layout = QtWidgets.QHBoxLayout()
-        limb_settings_layout.addWidget(self.limb_type_label)
-        limb_settings_layout.addWidget(self.limb_type_combo)
-        self.limb_settings_widget.setLayout(limb_settings_layout)
+    def _build_neck_settings(self):
+        """
+        Create the neck settings page.
 
-        # Neck settings
-        self.neck_settings_widget = QtWidgets.QWidget()
+        Returns:
+            QtWidgets.QWidget: Neck settings widget
+        """
+        neck_settings_widget = QtWidgets.QWidget()
         self.neck_joints_label = QtWidgets.QLabel("Number of Neck Joints:")
         self.neck_joints_spinner = QtWidgets.QSpinBox()
         self.neck_joints_spinner.setRange(1, 5)
         self.neck_joints_spinner.setValue(3)
 
         neck_settings_layout = QtWidgets.QHBoxLayout()
+        neck_settings_layout.setContentsMargins(0, 0, 0, 0)
         neck_settings_layout.addWidget(self.neck_joints_label)
         neck_settings_layout.addWidget(self.neck_joints_spinner)
-        self.neck_settings_widget.setLayout(neck_settings_layout)
+        neck_settings_widget.setLayout(neck_settings_layout)
+
+        return neck_settings_widget
 
-        # Head settings (empty for now)
-        self.head_settings_widget = QtWidgets.QWidget()
+    def _build_head_settings(self):
+        """
+        Create the head settings page (no settings for now).
+
+        Returns:
+            QtWidgets.QWidget: Head settings widget
+        """
+        head_settings_widget = QtWidgets.QWidget()
         self.head_settings_label = QtWidgets.QLabel("No settings needed for head module")
 
         head_settings_layout = QtWidgets.QHBoxLayout()
+        head_settings_layout.setContentsMargins(0, 0, 0, 0)
         head_settings_layout.addWidget(self.head_settings_label)
-        self.head_settings_widget.setLayout(head_settings_layout)
-
-        # Stacked widget to switch between module settings
-        self.settings_stack = QtWidgets.QStackedWidget()
-        self.settings_stack.addWidget(self.spine_settings_widget)  # 0 - Spine
-        self.settings_stack.addWidget(self.limb_settings_widget)  # 1 - Limb (Arm/Leg)
-        self.settings_stack.addWidget(self.neck_settings_widget)  # 2 - Neck
-        self.settings_stack.addWidget(self.head_settings_widget)  # 3 - Head
+        head_settings_widget.setLayout(head_settings_layout)
 
-        # Module List section
-        self.module_list_label = QtWidgets.QLabel("Added Modules:")
-        self.module_list = QtWidgets.QListWidget()
+        return head_settings_widget
 
-        # Guide and Build Controls section
-        self.create_guides_button = QtWidgets.QPushButton("Create All Guides")
-        self.create_guides_button.setEnabled(False)
-
-        self.save_guides_button = QtWidgets.QPushButton("Save Guide Positions")
-        self.save_guides_button.setEnabled(False)
-
-        self.load_guides_button = QtWidgets.QPushButton("Load Guide Positions")
-        self.load_guides_button.setEnabled(False)
+    def _build_limb_settings(self):
+        """
+        Create the limb settings page.
 
-        self.build_rig_button = QtWidgets.QPushButton("BUILD RIG")
-        self.build_rig_button.setEnabled(False)
-        self.build_rig_button.setStyleSheet("background-color: #4CAF50; color: white; font-weight: bold;")
+        Returns:
+            QtWidgets.QWidget: Limb settings widget
+        """
+        limb_settings_widget = QtWidgets.QWidget()
+        self.limb_type_label = QtWidgets.QLabel("Limb Type:")
+        self.limb_type_combo = QtWidgets.QComboBox()
+        self.limb_type_combo.addItems(["Arm", "Leg"])
 
-        self.add_root_button = QtWidgets.QPushButton("Add Root Joint")
-        self.add_root_button.setEnabled(False)
-        self.add_root_button.setStyleSheet("background-color: #FFA500; color: white; font-weight: bold;")
+        limb_settings_layout = QtWidgets.QHBoxLayout()
+        limb_settings_layout.setContentsMargins(0, 0, 0, 0)
+        limb_settings_layout.addWidget(self.limb_type_label)
+        limb_settings_layout.addWidget(self.limb_type_combo)
+        limb_settings_widget.setLayout(limb_settings_layout)
 
-        # Add Cleanup button in the build controls section
-        self.cleanup_button = QtWidgets.QPushButton("Cleanup Scene")
-        self.cleanup_button.setStyleSheet("background-color: #FFC300; color: black; font-weight: bold;")
-        self.cleanup_button.setEnabled(False)  # Initially disabled until rig is initialized
+        return limb_settings_widget
 
     def create_layouts(self):
         """Create the UI layouts."""
-        main_layout = QtWidgets.QVBoxLayout(self)
+        self.main_layout = QtWidgets.QVBoxLayout(self)
 
         # Character Settings group
         character_group = QtWidgets.QGroupBox("Character Settings")
@@ -165,6 +381,14 @@ class ModularRigUI(QtWidgets.QDialog):
         character_layout.addWidget(self.init_button)
         character_group.setLayout(character_layout)
 
+        self.main_layout.addWidget(character_group)
+        self.main_layout.addWidget(self.status_bar)
+
+        # Resolve geometry once now instead of via deferred layout requests on first show
+        self.main_layout.activate()
+
+    def _create_module_layouts(self):
+        """Lay out the module, module list and build groups under the character group."""
         # Module Creation group
         module_creation_group = QtWidgets.QGroupBox("Add Module")
         module_creation_layout = QtWidgets.QGridLayout()
@@ -197,6 +421,7 @@ class ModularRigUI(QtWidgets.QDialog):
         build_layout = QtWidgets.QVBoxLayout()
 
         guide_layout = QtWidgets.QHBoxLayout()
+        guide_layout.setContentsMargins(0, 0, 0, 0)
         guide_layout.addWidget(self.create_guides_button)
         guide_layout.addWidget(self.save_guides_button)
         guide_layout.addWidget(self.load_guides_button)
@@ -206,838 +431,1342 @@ class ModularRigUI(QtWidgets.QDialog):
 
         build_layout.addWidget(self.add_root_button)
         # Add cleanup button to the build layout
-        build_layout.addWidget(self.cleanup_button)
+        cleanup_layout = QtWidgets.QHBoxLayout()
+        cleanup_layout.setContentsMargins(0, 0, 0, 0)
+        cleanup_layout.addWidget(self.cleanup_button, 1)
+        cleanup_layout.addWidget(self.cleanup_undo_checkbox)
+        build_layout.addLayout(cleanup_layout)
 
         build_group.setLayout(build_layout)
 
-        # Add all groups to main layout
-        main_layout.addWidget(character_group)
-        main_layout.addWidget(module_creation_group)
-        main_layout.addWidget(module_list_group)
-        main_layout.addWidget(build_group)
+        # Add the module groups below the character group, keeping the status bar last
+        status_index = self.main_layout.indexOf(self.status_bar)
+        self.main_layout.insertWidget(status_index, module_creation_group)
+        self.main_layout.insertWidget(status_index + 1, module_list_group)
+        self.main_layout.insertWidget(status_index + 2, build_group)
+
+        self.main_layout.activate()
 
     def create_connections(self):
         """Create signal/slot connections."""
-        # Connect signals
-        self.module_type_combo.currentIndexChanged.connect(self.update_settings_stack)
         self.init_button.clicked.connect(self.initialize_rig)
+
+    def _create_module_connections(self):
+        """Create signal/slot connections for the module panels."""
+        # Connect signals
+        self.module_type_combo.currentIndexChanged.connect(self._on_module_type_changed)
         self.add_module_button.clicked.connect(self.add_module)
-        self.create_guides_button.clicked.connect(self.create_guides)
-        self.save_guides_button.clicked.connect(self.save_guide_positions)
-        self.load_guides_button.clicked.connect(self.load_guide_positions)
-        self.build_rig_button.clicked.connect(self.build_rig)
-        self.mirror_modules_button.clicked.connect(self.mirror_modules)
 
-        # Set default module name
-        self.update_module_name()
-        self.module_type_combo.currentIndexChanged.connect(self.update_module_name)
+        # Queue the slots that run scene work so the pressed button and the
+        # status bar repaint before the work starts
+        queued = QtCore.Qt.QueuedConnection
+        self.create_guides_button.clicked.connect(self.create_guides, queued)
+        self.save_guides_button.clicked.connect(self.save_guide_positions, queued)
+        self.load_guides_button.clicked.connect(self.load_guide_positions, queued)
+        self.build_rig_button.clicked.connect(self.build_rig, queued)
+        self.mirror_modules_button.clicked.connect(self.mirror_modules, queued)
+
+        # Show the settings page and default module name for the initial module type
+        self.update_settings_stack(self.module_type_combo.currentIndex())
+        self._apply_module_name()
+        self._name_update_timer.timeout.connect(self._apply_module_name)
         self.module_side_combo.currentIndexChanged.connect(self.update_module_name)
 
-        self.add_root_button.clicked.connect(self.add_root_joint)
+        self.add_root_button.clicked.connect(self.add_root_joint, queued)
 
         # Connect cleanup button
-        self.cleanup_button.clicked.connect(self.cleanup_scene)
-        # Enable cleanup button when rig is initialized
-        self.init_button.clicked.connect(lambda: self.cleanup_button.setEnabled(True))
+        self.cleanup_button.clicked.connect(self.cleanup_scene, queued)
+
+    def _build_module_ui(self):
+        """Build the module panels the first time the rig is initialized."""
+        if self._module_ui_built:
+            return
 
+        self._create_module_widgets()
+        self._create_module_layouts()
+        self._create_module_connections()
+        self._module_ui_built = True
+
+    def _disconnect_signals(self):
+        """Disconnect everything wired in create_connections to break Qt/Python reference cycles."""
+        signals = [self.init_button.clicked, self._ask_box.finished]
+        if self._module_ui_built:
+            signals.extend((
+                self.module_type_combo.currentIndexChanged,
+                self.module_side_combo.currentIndexChanged,
+                self._name_update_timer.timeout,
+                self.add_module_button.clicked,
+                self.create_guides_button.clicked,
+                self.save_guides_button.clicked,
+                self.load_guides_button.clicked,
+                self.build_rig_button.clicked,
+                self.mirror_modules_button.clicked,
+                self.add_root_button.clicked,
+                self.cleanup_button.clicked,
+            ))
+        for signal in signals:
+            try:
+                signal.disconnect()
+            except (RuntimeError, TypeError):
+                # Nothing connected to this signal
+                pass
+
+    def closeEvent(self, event):
+        """Release signal connections when the dialog is closed, it is deleted right after."""
+        if self._module_ui_built:
+            self._name_update_timer.stop()
+        self._disconnect_signals()
+        super(ModularRigUI, self).closeEvent(event)
+
+    @QtCore.Slot(int)
+    def _on_module_type_changed(self, index):
+        """Update the settings page and the module name for the new module type."""
+        self.update_settings_stack(index)
+        self.update_module_name()
+
+    @QtCore.Slot(int)
     def update_settings_stack(self, index):
         """Update the settings stack widget based on the selected module type."""
         if index == 0:  # Spine
-            self.settings_stack.setCurrentIndex(0)
+            self.settings_stack.setCurrentWidget(self._settings_page("spine"))
         elif index in [1, 2]:  # Arm or Leg
-            self.settings_stack.setCurrentIndex(1)
-            # Update limb type combo box based on selection
-            self.limb_type_combo.setCurrentIndex(0 if index == 1 else 1)  # Arm or Leg
+            self.settings_stack.setCurrentWidget(self._settings_page("limb"))
+            # Update limb type combo box based on selection without re-emitting currentIndexChanged
+            with QtCore.QSignalBlocker(self.limb_type_combo):
+                self.limb_type_combo.setCurrentIndex(0 if index == 1 else 1)  # Arm or Leg
         elif index == 3:  # Neck
-            self.settings_stack.setCurrentIndex(2)
+            self.settings_stack.setCurrentWidget(self._settings_page("neck"))
         elif index == 4:  # Head
-            self.settings_stack.setCurrentIndex(3)
+            self.settings_stack.setCurrentWidget(self._settings_page("head"))
 
+    @QtCore.Slot()
     def update_module_name(self):
+        """Schedule a module name update, coalescing bursts of combo changes into one."""
+        self._name_update_timer.start()
+
+    @QtCore.Slot()
+    def _apply_module_name(self):
         """Update the module name field based on the selected type and side."""
         module_type = self.module_type_combo.currentText().lower()
-        side = self.module_side_combo.currentText().lower()
+        self._current_side = _SIDE_CODE[self.module_side_combo.currentText()]
 
-        if side == "center":
-            side_prefix = "c"
-        elif side == "left":
-            side_prefix = "l"
-        elif side == "right":
-            side_prefix = "r"
-
-        self.module_name_field.setText(f"{module_type}")
+        # Skip setText when nothing changed to avoid a redundant textChanged/repaint
+        if self.module_name_field.text() != module_type:
+            self.module_name_field.setText(module_type)
 
+    @QtCore.Slot()
     def initialize_rig(self):
         """Initialize the rig manager."""
         character_name = self.character_name_field.text()
         if not character_name:
-            QtWidgets.QMessageBox.warning(self, "Warning", "Please enter a character name.")
+            self._warn("Please enter a character name.")
             return
 
         # Initialize the module manager
         self.manager = ModuleManager(character_name)
 
-        # Enable module controls
-        self.add_module_button.setEnabled(True)
-        self.create_guides_button.setEnabled(True)
-        self.save_guides_button.setEnabled(True)
-        self.load_guides_button.setEnabled(True)
-        self.build_rig_button.setEnabled(True)
-        self.mirror_modules_button.setEnabled(True)
-        self.add_root_button.setEnabled(True)
+        # Build the module panels on first initialization
+        self._build_module_ui()
+
+        # Enable module controls in one batch with a single repaint
+        self.setUpdatesEnabled(False)
+        try:
+            for button in self._gated_buttons:
+                button.setEnabled(True)
+        finally:
+            self.setUpdatesEnabled(True)
 
-        QtWidgets.QMessageBox.information(self, "Success", f"Initialized rig for character: {character_name}")
+        self._info(f"Initialized rig for character: {character_name}")
 
+    @QtCore.Slot()
+    @_requires_manager(need_modules=False)
     def add_module(self):
         """Add a module to the rig."""
-        if not self.manager:
-            QtWidgets.QMessageBox.warning(self, "Warning", "Please initialize the rig first.")
-            return
+        # Apply a name update still waiting on the timer before reading the fields
+        if self._name_update_timer.isActive():
+            self._name_update_timer.stop()
+            self._apply_module_name()
 
         module_type = self.module_type_combo.currentText()
-        side_text = self.module_side_combo.currentText()
         module_name = self.module_name_field.text()
 
         if not module_name:
-            QtWidgets.QMessageBox.warning(self, "Warning", "Please enter a module name.")
+            self._warn("Please enter a module name.")
             return
 
-        # Convert side to code
-        if side_text == "Center":
-            side = "c"
-        elif side_text == "Left":
-            side = "l"
-        elif side_text == "Right":
-            side = "r"
+        # Side code is resolved by _apply_module_name whenever the side combo changes
+        side = self._current_side
 
         # Create the appropriate module type
-        module = None
-        if module_type == "Spine":
-            num_joints = self.spine_joints_spinner.value()
-            module = SpineModule(side, module_name, num_joints)
-        elif module_type in ["Arm", "Leg"]:
-            limb_type = self.limb_type_combo.currentText().lower()
-            module = LimbModule(side, module_name, limb_type)
-        elif module_type == "Neck":
-            num_joints = self.neck_joints_spinner.value()
-            module = NeckModule(side, module_name, num_joints)
-        elif module_type == "Head":
-            module = HeadModule(side, module_name)
+        factory = self._module_factory.get(module_type)
+        module = factory(side, module_name) if factory else None
 
         if module:
             # Register the module
             self.manager.register_module(module)
 
             # Add to the module list
-            list_item = QtWidgets.QListWidgetItem(f"{side}_{module_name} ({module_type})")
-            self.module_list.addItem(list_item)
+            row = self._module_model.rowCount()
+            self._module_model.insertRows(row, 1)
+            label = "".join((side, "_", module_name, " (", module_type, ")"))
+            self._module_model.setData(self._module_model.index(row), label)
 
-            QtWidgets.QMessageBox.information(self, "Success", f"Added {module_type} module: {side}_{module_name}")
+            self._info(f"Added {module_type} module: {side}_{module_name}")
 
+    @QtCore.Slot()
+    @_requires_manager()
     def create_guides(self):
         """Create guides for all modules."""
-        if not self.manager:
-            QtWidgets.QMessageBox.warning(self, "Warning", "Please initialize the rig first.")
+        self._show_status("Creating guides...", repaint=True)
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+        try:
+            # One undo step and a single viewport redraw for every module's guides
+            with self._progress_dialog("Creating guides...", len(self.manager.modules)) as progress, \
+                    self._scene_edit("autorig_create_guides"):
+                self.manager.create_all_guides(progress)
+        except Exception as e:
+            self._show_status("Creating guides failed.")
+            self._warn(f"Creating guides failed: {str(e)}")
             return
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
 
-        if not self.manager.modules:
-            QtWidgets.QMessageBox.warning(self, "Warning", "No modules added yet.")
+        self._info("Created guides for all modules. Please position them as needed.")
+
+    def _warn(self, message, interactive=True):
+        """
+        Show a message in the reusable warning dialog.
+
+        Args:
+            message (str): Text to display
+            interactive (bool): Log the message instead of blocking on a dialog when False
+        """
+        if not interactive:
+            log.warning(message)
             return
 
-        self.manager.create_all_guides()
+        self._warn_box.setText(message)
+        self._warn_box.open()
 
-        QtWidgets.QMessageBox.information(self, "Success",
-                                          "Created guides for all modules. Please position them as needed.")
+    def _show_status(self, message, repaint=False):
+        """
+        Show a message in the status bar without blocking.
 
-    def save_guide_positions(self):
-        """Save guide positions to a file."""
-        if not self.manager:
-            QtWidgets.QMessageBox.warning(self, "Warning", "Please initialize the rig first.")
-            return
+        Args:
+            message (str): Text to display
+            repaint (bool): Paint the status bar right away, for messages shown
+                just before blocking scene work
+        """
+        self.status_bar.showMessage(message)
+        if repaint:
+            self.status_bar.repaint()
 
-        if not self.manager.modules:
-            QtWidgets.QMessageBox.warning(self, "Warning", "No modules added yet.")
-            return
+    def _info(self, message, title="Success"):
+        """
+        Show a message in the reusable information dialog.
 
-        file_path, _ = QtWidgets.QFileDialog.getSaveFileName(
-            self, "Save Guide Positions", "", "JSON Files (*.json)"
-        )
+        Args:
+            message (str): Text to display
+            title (str): Window title of the dialog
+        """
+        self._info_box.setWindowTitle(title)
+        self._info_box.setText(message)
+        self._info_box.open()
+
+    def _ask(self, title, message, on_yes):
+        """
+        Ask a Yes/No question without blocking in a nested event loop.
+
+        Args:
+            title (str): Window title of the dialog
+            message (str): Question to display
+            on_yes (callable): Called once the user answers Yes
+        """
+        self._ask_box.setWindowTitle(title)
+        self._ask_box.setText(message)
+        self._ask_on_yes = on_yes
+        self._ask_box.open()
+
+    @QtCore.Slot(int)
+    def _on_ask_finished(self, result):
+        """Run the pending _ask() continuation if the user answered Yes."""
+        on_yes, self._ask_on_yes = self._ask_on_yes, None
+        if on_yes is not None and result == int(QtWidgets.QMessageBox.Yes):
+            on_yes()
+
+    @contextlib.contextmanager
+    def _progress_dialog(self, label, maximum):
+        """
+        Show a progress dialog without a cancel button for synchronous scene work.
+
+        The dialog is not modal and is repainted directly: a modal dialog runs the
+        event loop in setValue(), which would let other commands land in the open
+        undo chunk.
+
+        Args:
+            label (str): Text shown above the progress bar
+            maximum (int): Number of steps
+
+        Yields:
+            callable: Takes the number of steps done and the step label, and
+                repaints the dialog
+        """
+        progress = QtWidgets.QProgressDialog(label, None, 0, maximum, self)
+        progress.setWindowModality(QtCore.Qt.NonModal)
+        progress.setMinimumDuration(0)
+        progress.show()
+        progress.repaint()
+
+        def update(value, step_label):
+            progress.setLabelText(step_label)
+            progress.setValue(value)
+            progress.repaint()
+
+        try:
+            yield update
+        finally:
+            progress.close()
+            progress.deleteLater()
+
+    def _begin_scene_edit(self, chunk_name):
+        """
+        Suspend viewport refresh and open an undo chunk for a batch of scene edits.
+
+        Every call must be paired with _end_scene_edit().
+
+        Args:
+            chunk_name (str): Name of the undo chunk
+        """
+        cmds.refresh(suspend=True)
+        try:
+            cmds.undoInfo(openChunk=True, chunkName=chunk_name)
+        except RuntimeError:
+            cmds.refresh(suspend=False)
+            raise
+
+        # Stop the cached playback from being invalidated by every edit,
+        # it is invalidated once in _end_scene_edit() instead
+        try:
+            cmds.cacheEvaluator(pauseInvalidation=True)
+            self._cache_invalidation_paused = True
+        except (AttributeError, TypeError, RuntimeError):
+            # Maya versions without the cache evaluator flags
+            self._cache_invalidation_paused = False
+
+    def _end_scene_edit(self):
+        """Close the undo chunk opened by _begin_scene_edit() and redraw the viewport once."""
+        if self._cache_invalidation_paused:
+            self._cache_invalidation_paused = False
+            try:
+                cmds.cacheEvaluator(resumeInvalidation=True)
+                start = cmds.playbackOptions(query=True, minTime=True)
+                end = cmds.playbackOptions(query=True, maxTime=True)
+                cmds.cacheEvaluator(cacheInvalidate=(start, end))
+            except (TypeError, RuntimeError) as e:
+                log.warning("Could not resume cache invalidation: %s", e)
+
+        cmds.undoInfo(closeChunk=True)
+        cmds.refresh(suspend=False)
+        cmds.refresh(force=True)
+
+    @contextlib.contextmanager
+    def _scene_edit(self, chunk_name, pause_evaluation=False):
+        """
+        Context manager form of _begin_scene_edit()/_end_scene_edit() for synchronous work.
+
+        Args:
+            chunk_name (str): Name of the undo chunk
+            pause_evaluation (bool): Also switch the evaluation manager to DG mode, turn
+                off cycle checking and switch to the select tool, so heavy reparenting is
+                evaluated once afterwards and no manipulator tracks the edited nodes
+        """
+        began = False
+        # Restore callbacks for the settings that were actually changed, undone in reverse
+        restore = []
+        try:
+            self._begin_scene_edit(chunk_name)
+            began = True
+            if pause_evaluation:
+                evaluation_mode = cmds.evaluationManager(query=True, mode=True)[0]
+                cmds.evaluationManager(mode="off")
+                restore.append(functools.partial(cmds.evaluationManager, mode=evaluation_mode))
+
+                cycle_check = cmds.cycleCheck(query=True, evaluation=True)
+                cmds.cycleCheck(evaluation=False)
+                restore.append(functools.partial(cmds.cycleCheck, evaluation=cycle_check))
+
+                current_tool = cmds.currentCtx()
+                cmds.setToolTo("selectSuperContext")
+                restore.append(functools.partial(cmds.setToolTo, current_tool))
+            yield
+        finally:
+            for undo in reversed(restore):
+                try:
+                    undo()
+                except RuntimeError as e:
+                    log.warning("Could not restore scene setting: %s", e)
+            if began:
+                self._end_scene_edit()
+
+    @QtCore.Slot()
+    @_requires_manager()
+    def save_guide_positions(self):
+        """Save guide positions to a file."""
+        file_path = self._get_json_file_path("Save Guide Positions", QtWidgets.QFileDialog.AcceptSave)
 
         if file_path:
             self.manager.save_guide_positions(file_path)
-            QtWidgets.QMessageBox.information(self, "Success", f"Saved guide positions to: {file_path}")
+            self._info(f"Saved guide positions to: {file_path}")
 
+    @QtCore.Slot()
+    @_requires_manager()
     def load_guide_positions(self):
         """Load guide positions from a file."""
-        if not self.manager:
-            QtWidgets.QMessageBox.warning(self, "Warning", "Please initialize the rig first.")
-            return
-
-        if not self.manager.modules:
-            QtWidgets.QMessageBox.warning(self, "Warning", "No modules added yet.")
-            return
-
-        file_path, _ = QtWidgets.QFileDialog.getOpenFileName(
-            self, "Load Guide Positions", "", "JSON Files (*.json)"
-        )
+        file_path = self._get_json_file_path("Load Guide Positions", QtWidgets.QFileDialog.AcceptOpen)
 
         if file_path:
             self.manager.load_guide_positions(file_path)
-            QtWidgets.QMessageBox.information(self, "Success", f"Loaded guide positions from: {file_path}")
+            self._info(f"Loaded guide positions from: {file_path}")
 
-    def build_rig(self):
-        """Build the rig."""
-        if not self.manager:
-            QtWidgets.QMessageBox.warning(self, "Warning", "Please initialize the rig first.")
-            return
+    def _get_json_file_path(self, title, accept_mode):
+        """
+        Ask the user for a JSON file using the shared file dialog.
 
-        if not self.manager.modules:
-            QtWidgets.QMessageBox.warning(self, "Warning", "No modules added yet.")
-            return
+        Args:
+            title (str): Dialog window title
+            accept_mode (QFileDialog.AcceptMode): AcceptSave or AcceptOpen
 
-        # Confirm with user
-        result = QtWidgets.QMessageBox.question(
-            self,
-            "Build Rig",
-            "Are you sure you want to build the rig? This will create the final rig structure based on the current guide positions.",
-            QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No
-        )
+        Returns:
+            str: Selected file path, or an empty string if cancelled
+        """
+        dialog = self._file_dialog
+        dialog.setWindowTitle(title)
+        dialog.setAcceptMode(accept_mode)
+        if accept_mode == QtWidgets.QFileDialog.AcceptSave:
+            dialog.setFileMode(QtWidgets.QFileDialog.AnyFile)
+        else:
+            dialog.setFileMode(QtWidgets.QFileDialog.ExistingFile)
+
+        if dialog.exec_() != QtWidgets.QDialog.Accepted:
+            return ""
+
+        selected = dialog.selectedFiles()
+        return selected[0] if selected else ""
+
+    @QtCore.Slot()
+    @_requires_manager()
+    def build_rig(self, *, interactive=True):
+        """
+        Build the rig.
 
-        if result == QtWidgets.QMessageBox.Yes:
-            self.manager.build_all_modules()
-            QtWidgets.QMessageBox.information(self, "Success", "Rig built successfully!")
+        Args:
+            interactive (bool): Ask for confirmation and report errors in dialogs.
+                Scripted callers pass interactive=False to run without any blocking prompt.
+        """
+        if interactive:
+            self._ask(
+                "Build Rig",
+                "Are you sure you want to build the rig? This will create the final rig structure based on the current guide positions.",
+                functools.partial(self._start_build, interactive)
+            )
+        else:
+            self._start_build(interactive)
 
-    def mirror_modules(self):
-        """Mirror left side modules to right side."""
-        if not self.manager:
-            QtWidgets.QMessageBox.warning(self, "Warning", "Please initialize the rig first.")
-            return
+    def _start_build(self, interactive):
+        """
+        Build every module once the build has been confirmed.
 
-        # Verify we have modules to mirror
-        if not self.manager.modules:
-            QtWidgets.QMessageBox.warning(self, "Warning", "No modules added yet.")
+        Args:
+            interactive (bool): Report a failure in a dialog instead of the log
+        """
+        self._show_status("Building rig...", repaint=True)
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+        try:
+            # Record the whole build as one undo step with a single viewport redraw,
+            # showing one progress step per module plus the final cluster pass
+            with self._progress_dialog("Building rig...", len(self.manager.modules) + 1) as progress, \
+                    self._scene_edit("autorig_build_rig"):
+                self.manager.build_all_modules(progress)
+        except Exception as e:
+            self._show_status("Rig build failed.")
+            self._warn(f"Rig build failed: {str(e)}", interactive)
             return
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+
+        self._show_status("Rig built successfully!")
+
+    @QtCore.Slot()
+    @_requires_manager()
+    def mirror_modules(self, *, interactive=True):
+        """
+        Mirror left side modules to right side.
 
+        Args:
+            interactive (bool): Ask for confirmation and report errors in dialogs
+        """
         # Check if there are any left side modules to mirror
-        left_modules = [m for m in self.manager.modules.values() if m.side == "l"]
-        if not left_modules:
-            QtWidgets.QMessageBox.warning(self, "Warning", "No left side modules found to mirror.")
+        if not self.manager.modules_on_side("l"):
+            self._warn("No left side modules found to mirror.", interactive)
             return
 
-        # Confirm with user
-        result = QtWidgets.QMessageBox.question(
-            self,
-            "Mirror Modules",
-            "This will mirror all left side modules to the right side. Continue?",
-            QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No
-        )
+        if interactive:
+            self._ask(
+                "Mirror Modules",
+                "This will mirror all left side modules to the right side. Continue?",
+                functools.partial(self._run_mirror_modules, interactive)
+            )
+        else:
+            self._run_mirror_modules(interactive)
 
-        if result == QtWidgets.QMessageBox.Yes:
-            # Execute mirroring
-            mirrored_count = self.manager.mirror_modules()
+    def _run_mirror_modules(self, interactive):
+        """
+        Mirror the left side modules once the operation has been confirmed.
 
-            # Update the module list in the UI
-            self.update_module_list()
+        Args:
+            interactive (bool): Report a failure in a dialog instead of the log
+        """
+        self._show_status("Mirroring modules...", repaint=True)
+
+        try:
+            # Execute mirroring as one undo step with the viewport redrawn once at the end
+            with self._scene_edit("autorig_mirror_modules", pause_evaluation=True):
+                mirrored_count = self.manager.mirror_modules()
+        except Exception as e:
+            self._show_status("Mirroring modules failed.")
+            self._warn(f"Mirroring modules failed: {str(e)}", interactive)
+            return
 
-            QtWidgets.QMessageBox.information(
-                self,
-                "Success",
-                f"Mirrored {mirrored_count} modules to the right side."
-            )
+        # Update the module list in the UI
+        self.update_module_list()
 
+        self._show_status(f"Mirrored {mirrored_count} modules to the right side.")
+
+    @QtCore.Slot()
     def update_module_list(self):
         """Update the module list in the UI."""
-        # Clear the existing list
-        self.module_list.clear()
-
-        # Add all modules from the manager
-        for module_id, module in self.manager.modules.items():
-            module_type = module.module_type.capitalize()
-            list_item = QtWidgets.QListWidgetItem(f"{module.side}_{module.module_name} ({module_type})")
-            self.module_list.addItem(list_item)
-
-    def add_root_joint(self):
-        """Add a root joint and create proper joint hierarchy, connecting controls appropriately."""
-        if not self.manager:
-            QtWidgets.QMessageBox.warning(self, "Warning", "Please initialize the rig first.")
+        # Replace the model contents with all modules from the manager
+        labels = [f"{module.side}_{module.module_name} ({module.module_type.capitalize()})"
+                  for module in self.manager.modules.values()]
+
+        # Modules are appended and removed in order, so keep the rows the list
+        # already shares with the manager and only replace the ones after them
+        current = self._module_model.stringList()
+        keep = 0
+        for old_label, new_label in zip(current, labels):
+            if old_label != new_label:
+                break
+            keep += 1
+        if keep == len(current) == len(labels):
             return
 
-        # Confirm with user
-        result = QtWidgets.QMessageBox.question(
-            self, "Add Root Joint",
-            "This will create a root joint and modify the hierarchy. Continue?",
-            QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No
-        )
+        # Suspend view painting so the row changes are laid out once
+        self.module_list.setUpdatesEnabled(False)
+        try:
+            if keep < len(current):
+                self._module_model.removeRows(keep, len(current) - keep)
+            if keep < len(labels):
+                self._module_model.insertRows(keep, len(labels) - keep)
+                for row in range(keep, len(labels)):
+                    self._module_model.setData(self._module_model.index(row), labels[row])
+        finally:
+            self.module_list.setUpdatesEnabled(True)
+
+    @QtCore.Slot()
+    @_requires_manager()
+    def add_root_joint(self, *, interactive=True):
+        """
+        Add a root joint and create proper joint hierarchy, connecting controls appropriately.
+
+        Args:
+            interactive (bool): Ask for confirmation and report errors in dialogs
+        """
+        if interactive:
+            self._ask(
+                "Add Root Joint",
+                "This will create a root joint and modify the hierarchy. Continue?",
+                functools.partial(self._run_add_root_joint, interactive)
+            )
+        else:
+            self._run_add_root_joint(interactive)
+
+    def _run_add_root_joint(self, interactive):
+        """
+        Build the root hierarchy once the operation has been confirmed.
 
-        if result == QtWidgets.QMessageBox.Yes:
-            # Important: Reference to the joints group
-            joints_grp = self.manager.joints_grp
-
-            # Check if we already have a root joint
-            root_joint_name = f"{self.manager.character_name}_root_jnt"
-            if cmds.objExists(root_joint_name):
-                cmds.delete(root_joint_name)
-
-            # Create the root joint directly under the joints group
-            cmds.select(clear=True)
-            cmds.select(joints_grp)  # Select the joints group first
-            root_joint = cmds.joint(name=root_joint_name, position=(0, 0, 0))
-            print(f"Created {root_joint} under {joints_grp}")
-
-            # Create the root control
-            # Standard purple color: RGB(128, 0, 128)
-            root_ctrl_name = f"{self.manager.character_name}_root_ctrl"
-            root_ctrl = cmds.circle(
-                name=root_ctrl_name,
-                normal=[0, 1, 0],  # Y-up orientation
-                radius=30.0  # Larger size for visibility
-            )[0]
-
-            # Color the control purple
-            shape = cmds.listRelatives(root_ctrl, shapes=True)[0]
-            cmds.setAttr(f"{shape}.overrideEnabled", 1)
-            cmds.setAttr(f"{shape}.overrideRGBColors", 1)
-            cmds.setAttr(f"{shape}.overrideColorR", 0.5)  # Red component
-            cmds.setAttr(f"{shape}.overrideColorG", 0.0)  # Green component
-            cmds.setAttr(f"{shape}.overrideColorB", 0.5)  # Blue component
-
-            # Create control group
-            root_ctrl_grp = cmds.group(root_ctrl, name=f"{root_ctrl_name}_grp")
-
-            # Position the control at the root joint
-            cmds.delete(cmds.parentConstraint(root_joint, root_ctrl_grp, maintainOffset=False))
-
-            # Parent the control group to the control group
-            cmds.parent(root_ctrl_grp, self.manager.controls_grp)
-
-            # Parent the root joint to the root control
-            # First, create a parentConstraint to match positions
-            root_constraint = cmds.parentConstraint(
-                root_ctrl,
-                root_joint,
-                maintainOffset=True
-            )[0]
-
-            # Find top-level controls (direct children of the control group)
-            top_level_controls = []
-            control_children = cmds.listRelatives(self.manager.controls_grp, children=True, type="transform") or []
-
-            # Exclude the root control and its group
-            control_children = [ctrl for ctrl in control_children if
-                                ctrl != root_ctrl_grp and not ctrl.startswith(root_ctrl_name)]
-
-            print("\nFound top-level controls:")
-            for ctrl in control_children:
-                print(f"  {ctrl}")
+        Args:
+            interactive (bool): Report a failure in a dialog instead of the log
+        """
+        self._show_status("Adding root joint...", repaint=True)
+
+        try:
+            # Record the whole reorganization as one undo step, without per-command info
+            # echo in the script editor, viewport redraws, graph evaluation or a changed
+            # selection. Warnings stay visible so failed reparenting is still reported.
+            with self._scene_edit("autorig_add_root_joint", pause_evaluation=True), maintained_selection():
+                suppress_info = cmds.scriptEditorInfo(query=True, suppressInfo=True)
+                cmds.scriptEditorInfo(suppressInfo=True)
                 try:
-                    # Unparent from control group first
-                    cmds.parent(ctrl, world=True)
+                    error = self._build_root_hierarchy()
+                finally:
+                    cmds.scriptEditorInfo(suppressInfo=suppress_info)
+        except Exception as e:
+            error = f"Adding root joint failed: {str(e)}"
+
+        # Report a failure once the script editor settings and the scene edit are restored
+        if error:
+            self._show_status("Adding root joint failed.")
+            self._warn(error, interactive)
+
+    def _build_root_hierarchy(self):
+        """
+        Create the root joint and control and reparent every module under them.
 
-                    # Parent to root control
-                    cmds.parent(ctrl, root_ctrl)
-                    print(f"  Parented {ctrl} to root control")
-                except Exception as e:
-                    print(f"  Error parenting {ctrl}: {str(e)}")
+        Returns:
+            str: Why the hierarchy could not be built, or None on success
+        """
+        # Important: Reference to the joints group
+        joints_grp = self.manager.joints_grp
+
+        # The manager keeps its modules bucketed by module_type
+        # (limb modules carry their limb type, "arm" or "leg", as module_type)
+        spine_modules = self.manager.modules_of_type("spine")
+        arm_modules = self.manager.modules_of_type("arm")
+        leg_modules = self.manager.modules_of_type("leg")
+        neck_modules = self.manager.modules_of_type("neck")
+        head_modules = self.manager.modules_of_type("head")
+        limb_modules = arm_modules + leg_modules
+
+        root_joint_name = f"{self.manager.character_name}_root_jnt"
+        systems_grp_name = f"{self.manager.character_name}_rig_systems"
+        vis_grp_name = f"{self.manager.character_name}_visualizations"
+
+        # Find the COG joint before deleting or creating anything, so a rig without one is left untouched
+        cog_joint = None
+        spine_module = None
+        cog_control = None
+        for module in spine_modules:
+            if "cog" in module.joints:
+                spine_module = module
+                cog_joint = module.joints["cog"]
+                if "cog" in module.controls:
+                    cog_control = module.controls["cog"]
+                break
+
+        if not cog_joint or not cmds.objExists(cog_joint):
+            return "COG joint not found. Cannot complete hierarchy setup."
+
+        # Remove what a previous run left behind before taking the existence snapshot:
+        # deleting a group also deletes everything under it (the visualizations group
+        # lives under the systems group), which a snapshot taken earlier would miss
+        stale_nodes = self._existing_nodes([root_joint_name, systems_grp_name, vis_grp_name])
+        if stale_nodes:
+            # A previous run parented the COG under the root joint and moved the limb
+            # chains and pole curves into the systems group. Deleting the stale nodes
+            # would take them along, so bail out before deleting anything
+            module_nodes = [name for name in self._module_node_names() if name]
+            module_nodes.extend(module.utility_nodes['pole_viz_curve'] for module in limb_modules
+                                if module.utility_nodes.get('pole_viz_curve'))
+            stale_prefixes = tuple(path + "|" for path in cmds.ls(list(stale_nodes), long=True) or [])
+            held_nodes = [path for path in cmds.ls(module_nodes, long=True) or []
+                          if path.startswith(stale_prefixes)]
+            if held_nodes:
+                return ("The previous root hierarchy still holds the rig's joints or chains. "
+                        "Undo the previous Add Root Joint before running it again.")
+            cmds.delete(list(stale_nodes))
+
+        # Query existence of every node this method checks with a single cmds.ls call
+        existing = self._existing_nodes([self.manager.guides_grp] + self._module_node_names())
+
+        # Create the root joint directly under the joints group
+        cmds.select(clear=True)
+        cmds.select(joints_grp)  # Select the joints group first
+        root_joint = cmds.joint(name=root_joint_name, position=(0, 0, 0))
+        log.debug("Created %s under %s", root_joint, joints_grp)
+
+        # Create the root control
+        # Standard purple color: RGB(128, 0, 128)
+        root_ctrl_name = f"{self.manager.character_name}_root_ctrl"
+        root_ctrl = cmds.circle(
+            name=root_ctrl_name,
+            normal=[0, 1, 0],  # Y-up orientation
+            radius=30.0  # Larger size for visibility
+        )[0]
+
+        # Color the control purple
+        shape = cmds.listRelatives(root_ctrl, shapes=True)[0]
+        cmds.setAttr(f"{shape}.overrideEnabled", 1)
+        cmds.setAttr(f"{shape}.overrideRGBColors", 1)
+        cmds.setAttr(f"{shape}.overrideColorRGB", 0.5, 0.0, 0.5)  # Purple, set through the compound attribute
+
+        # Create control group
+        root_ctrl_grp = cmds.group(root_ctrl, name=f"{root_ctrl_name}_grp")
+
+        # Position the control at the root joint
+        cmds.delete(cmds.parentConstraint(root_joint, root_ctrl_grp, maintainOffset=False))
+
+        # Parent the control group to the control group
+        cmds.parent(root_ctrl_grp, self.manager.controls_grp)
+
+        # Parent the root joint to the root control
+        # First, create a parentConstraint to match positions
+        root_constraint = cmds.parentConstraint(
+            root_ctrl,
+            root_joint,
+            maintainOffset=True
+        )[0]
+
+        # Find top-level controls (direct children of the control group)
+        top_level_controls = []
+        control_children = cmds.listRelatives(self.manager.controls_grp, children=True, type="transform") or []
+
+        # Exclude the root control and its group
+        control_children = [ctrl for ctrl in control_children if
+                            ctrl != root_ctrl_grp and not ctrl.startswith(root_ctrl_name)]
+
+        # Parent all top-level controls to the root control in one call
+        if control_children:
+            log.debug("Found top-level controls: %s", ", ".join(control_children))
+            try:
+                cmds.parent(control_children, root_ctrl)
+                log.debug("Parented %s controls to root control", len(control_children))
+            except Exception as e:
+                log.warning("Error parenting top-level controls: %s", e)
+
+        try:
+            # Organize clusters
+            self.manager.organize_clusters()
+        except Exception as e:
+            log.warning("Error organizing clusters: %s", e)
+
+        self._show_status("Root joint and control created. All controls parented to root control.")
+
+        # Create a rig systems group for IK/FK chains
+        systems_grp = cmds.group(empty=True, name=systems_grp_name)
+        cmds.parent(systems_grp, self.manager.rig_grp)
+        log.info("Created rig systems group: %s", systems_grp)
+
+        # Create a visualizations group for curve visualization elements
+        vis_grp = cmds.group(empty=True, name=vis_grp_name)
+        cmds.parent(vis_grp, systems_grp)
+        log.debug("Created visualizations group: %s", vis_grp)
+
+        # Parent all pole vector visualization curves to the visualizations group in one call
+        pole_viz_curves = [module.utility_nodes['pole_viz_curve'] for module in limb_modules
+                           if module.utility_nodes.get('pole_viz_curve') in existing]
+        if pole_viz_curves:
+            cmds.parent(pole_viz_curves, vis_grp)
+            log.debug("Moved pole vector visualizations %s to %s", ", ".join(pole_viz_curves), vis_grp)
+
+        # Hide the guides group
+        if self.manager.guides_grp in existing:
+            cmds.setAttr(f"{self.manager.guides_grp}.visibility", 0)
+            log.debug("Guide group visibility turned off")
+
+        # STEP 1: Reparent COG to root
+        log.debug("--- STEP 1: Setting up main skeleton hierarchy ---")
+        cmds.parent(cog_joint, root_joint)
+        log.debug("Parented %s to %s", cog_joint, root_joint)
+
+        # STEP 2: Find the pelvis and chest in the spine module
+        pelvis_joint = spine_module.joints.get("pelvis")
+        chest_joint = spine_module.joints.get("chest")
+        chest_control = spine_module.controls.get("chest")
+        log.debug("Found chest control: %s", chest_control)
+
+        # Every later step hangs off the pelvis, the arms and neck also need the chest
+        has_pelvis = pelvis_joint in existing
+        has_chest = has_pelvis and chest_joint in existing and chest_control in existing
+
+        # State shared by the remaining steps
+        ctx = {
+            "existing": existing,
+            "systems_grp": systems_grp,
+            "pelvis_joint": pelvis_joint,
+            "chest_joint": chest_joint,
+            "chest_control": chest_control,
+            "arm_modules": arm_modules,
+            "leg_modules": leg_modules,
+            "neck_modules": neck_modules,
+            "head_modules": head_modules,
+        }
+
+        # STEPS 3-8 as (description, precondition, step), run in order
+        steps = (
+            ("Connect hips to pelvis", has_pelvis, self._root_step_legs),
+            ("Connect arms to chest", has_chest, self._root_step_arms),
+            ("Connect neck base to chest", has_chest and bool(neck_modules), self._root_step_neck),
+            ("Connect head to last neck joint", has_pelvis and bool(head_modules and neck_modules),
+             self._root_step_head),
+            ("Fix FK shoulder constraints", has_pelvis, self._root_step_fk_shoulders),
+            ("Organize clusters", has_pelvis, self._root_step_clusters),
+        )
+        for description, enabled, step in steps:
+            if not enabled:
+                log.debug("Skipping step: %s", description)
+                continue
+            log.debug("--- %s ---", description)
+            step(ctx)
+
+        if has_pelvis:
+            self._show_status("Root joint created and hierarchy organized.")
+
+    def _root_step_legs(self, ctx):
+        """
+        STEP 3: Parent the hips to the pelvis and move the leg IK/FK chains to the systems group.
+
+        Args:
+            ctx (dict): State shared by the add_root_joint steps, see _build_root_hierarchy
+        """
+        existing = ctx["existing"]
+        systems_grp = ctx["systems_grp"]
+        pelvis_joint = ctx["pelvis_joint"]
+        leg_modules = ctx["leg_modules"]
+
+        log.debug("Found %s leg modules to connect", len(leg_modules))
+
+        # Reparent hip joints to pelvis (only main binding joints) in one call
+        hip_joints = [leg_module.joints["hip"] for leg_module in leg_modules
+                      if leg_module.joints.get("hip") in existing]
+        if hip_joints:
+            cmds.parent(hip_joints, pelvis_joint)
+            log.debug("Reparented %s to %s", ", ".join(hip_joints), pelvis_joint)
+
+        for leg_module in leg_modules:
+            log.debug("Processing leg module: %s (side: %s)", leg_module.module_id, leg_module.side)
+
+            # Move IK/FK chains to systems group with constraints
+            for prefix, root_key in _LEG_CHAIN_ROOTS:
+                if root_key in leg_module.joints and leg_module.joints[root_key] in existing:
+                    root_joint = leg_module.joints[root_key]
+                    try:
+                        # Create a subgroup for this chain directly under the systems group
+                        chain_grp = cmds.createNode("transform", parent=systems_grp,
+                                                    name=f"{leg_module.module_id}_{prefix}chain_grp")
+
+                        # Create constraint to pelvis before unparenting
+                        # This ensures the IK/FK chains still follow the pelvis
+                        if prefix == "ik_":
+                            constraint_name = f"{root_joint}_to_pelvis_parentConstraint"
+                            if constraint_name not in existing:
+                                cmds.parentConstraint(pelvis_joint, root_joint, maintainOffset=True,
+                                                      name=constraint_name)
+                                log.debug("Created parent constraint from %s to %s", pelvis_joint, root_joint)
+
+                        # Parent to the chain group, cmds.parent keeps the world transform
+                        cmds.parent(root_joint, chain_grp)
+                        log.debug("Moved %s chain to systems group", root_joint)
+
+                    except Exception as e:
+                        log.warning("Error moving %s: %s", root_joint, e)
 
+    def _root_step_arms(self, ctx):
+        """
+        STEP 4: Connect the arm joints and controls to the chest and move the arm IK/FK chains.
+
+        Args:
+            ctx (dict): State shared by the add_root_joint steps, see _build_root_hierarchy
+        """
+        existing = ctx["existing"]
+        systems_grp = ctx["systems_grp"]
+        chest_joint = ctx["chest_joint"]
+        chest_control = ctx["chest_control"]
+        arm_modules = ctx["arm_modules"]
+
+        log.debug("Found %s arm modules to connect", len(arm_modules))
+
+        # 1. CONNECT CLAVICLE JOINTS TO CHEST JOINT, all arms in one call
+        chest_children = set(cmds.listRelatives(chest_joint, children=True) or [])
+        clavicle_joints = [arm_module.joints["clavicle"] for arm_module in arm_modules
+                           if arm_module.joints.get("clavicle") in existing]
+        clavicles_to_parent = [joint for joint in clavicle_joints if joint not in chest_children]
+        if clavicles_to_parent:
+            try:
+                cmds.parent(clavicles_to_parent, chest_joint)
+                log.debug("CONNECTED: Clavicle joints %s -> chest joint %s",
+                          ", ".join(clavicles_to_parent), chest_joint)
+            except Exception as e:
+                log.warning("ERROR parenting clavicle joints: %s", e)
+
+        # Pick up clavicle controls that exist in the scene but are missing from their module
+        for arm_module in arm_modules:
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Available controls in %s:", arm_module.module_id)
+                for control_name, control in arm_module.controls.items():
+                    log.debug("  %s: %s", control_name, control)
+
+            # IMPROVED: Check if clavicle control exists in the scene even if not in module
+            expected_clavicle_ctrl_name = f"{arm_module.module_id}_clavicle_ctrl"
+
+            # First check if it's in the module's controls
+            if "clavicle" not in arm_module.controls:
+                # Check if it exists in the scene anyway
+                if expected_clavicle_ctrl_name in existing:
+                    log.debug("Found existing clavicle control in scene: %s", expected_clavicle_ctrl_name)
+                    # Add it to the module's controls dictionary
+                    arm_module.controls["clavicle"] = expected_clavicle_ctrl_name
+                    arm_module.control_groups["clavicle"] = f"{expected_clavicle_ctrl_name}_grp"
+                else:
+                    log.debug("Clavicle control not found in scene or module: %s", expected_clavicle_ctrl_name)
+
+        # 2. CONNECT CLAVICLE CONTROLS TO CHEST CONTROL, all arms in one call
+        chest_control_children = set(cmds.listRelatives(chest_control, children=True) or [])
+        clavicle_ctrl_grps = [arm_module.get_control_group("clavicle") for arm_module in arm_modules
+                              if arm_module.controls.get("clavicle") in existing
+                              and arm_module.get_control_group("clavicle") in existing]
+        clavicle_grps_to_parent = [grp for grp in clavicle_ctrl_grps if grp not in chest_control_children]
+        if clavicle_grps_to_parent:
             try:
-                # Organize clusters
-                self.manager.organize_clusters()
+                cmds.parent(clavicle_grps_to_parent, chest_control)
+                log.debug("CONNECTED: Clavicle control groups %s -> chest control %s",
+                          ", ".join(clavicle_grps_to_parent), chest_control)
             except Exception as e:
-                print(f"Warning: Error organizing clusters: {str(e)}")
-
-            QtWidgets.QMessageBox.information(self, "Success",
-                                              "Root joint and control created. All controls parented to root control.")
-
-            # Create a rig systems group for IK/FK chains
-            systems_grp_name = f"{self.manager.character_name}_rig_systems"
-            if cmds.objExists(systems_grp_name):
-                cmds.delete(systems_grp_name)
-
-            systems_grp = cmds.group(empty=True, name=systems_grp_name)
-            cmds.parent(systems_grp, self.manager.rig_grp)
-            print(f"Created rig systems group: {systems_grp}")
-
-            # Create a visualizations group for curve visualization elements
-            vis_grp_name = f"{self.manager.character_name}_visualizations"
-            if cmds.objExists(vis_grp_name):
-                cmds.delete(vis_grp_name)
-
-            vis_grp = cmds.group(empty=True, name=vis_grp_name)
-            cmds.parent(vis_grp, systems_grp)
-            print(f"Created visualizations group: {vis_grp}")
-
-            # Find all pole vector visualization curves and parent them to the visualizations group
-            for module in self.manager.modules.values():
-                if isinstance(module, LimbModule) and hasattr(module, 'utility_nodes'):
-                    if 'pole_viz_curve' in module.utility_nodes:
-                        curve = module.utility_nodes['pole_viz_curve']
-                        if cmds.objExists(curve):
-                            cmds.parent(curve, vis_grp)
-                            print(f"Moved pole vector visualization {curve} to {vis_grp}")
-
-            # Hide the guides group
-            if self.manager.guides_grp and cmds.objExists(self.manager.guides_grp):
-                cmds.setAttr(f"{self.manager.guides_grp}.visibility", 0)
-                print("Guide group visibility turned off")
-
-            # Find the COG joint
-            cog_joint = None
-            spine_module = None
-            cog_control = None
-            for module in self.manager.modules.values():
-                if isinstance(module, SpineModule) and "cog" in module.joints:
-                    spine_module = module
-                    cog_joint = module.joints["cog"]
-                    if "cog" in module.controls:
-                        cog_control = module.controls["cog"]
-                    break
-
-            if not cog_joint or not cmds.objExists(cog_joint):
-                QtWidgets.QMessageBox.warning(self, "Warning", "COG joint not found. Cannot complete hierarchy setup.")
-                return
-
-            # STEP 1: Reparent COG to root
-            print("\n--- STEP 1: Setting up main skeleton hierarchy ---")
-            cmds.parent(cog_joint, root_joint)
-            print(f"Parented {cog_joint} to {root_joint}")
-
-            # STEP 2: Find the pelvis joint in the spine module
-            pelvis_joint = None
-            if spine_module and "pelvis" in spine_module.joints:
-                pelvis_joint = spine_module.joints["pelvis"]
-
-            # STEP 3: Connect hips to pelvis (binding joint chain and controls)
-            if pelvis_joint and cmds.objExists(pelvis_joint):
-                # Find all leg modules (both left and right sides)
-                leg_modules = [m for m in self.manager.modules.values() if
-                               isinstance(m, LimbModule) and m.limb_type == "leg"]
-
-                print(f"Found {len(leg_modules)} leg modules to connect")
-
-                # Reparent hip joints to pelvis (only main binding joints)
-                for leg_module in leg_modules:
-                    print(f"Processing leg module: {leg_module.module_id} (side: {leg_module.side})")
-
-                    if "hip" in leg_module.joints and cmds.objExists(leg_module.joints["hip"]):
-                        hip_joint = leg_module.joints["hip"]
-                        cmds.parent(hip_joint, pelvis_joint)
-                        print(f"Reparented {hip_joint} to {pelvis_joint}")
-
-                    # Move IK/FK chains to systems group with constraints
-                    for prefix in ["ik_", "fk_"]:
-                        root_key = f"{prefix}hip"
-                        if root_key in leg_module.joints and cmds.objExists(leg_module.joints[root_key]):
-                            root_joint = leg_module.joints[root_key]
-                            try:
-                                # Create a subgroup for this chain
-                                chain_grp = cmds.group(empty=True, name=f"{leg_module.module_id}_{prefix}chain_grp")
-                                cmds.parent(chain_grp, systems_grp)
-
-                                # Get current parent
-                                current_parent = cmds.listRelatives(root_joint, parent=True)
-
-                                # Create constraint to pelvis before unparenting
-                                # This ensures the IK/FK chains still follow the pelvis
-                                if prefix == "ik_":
-                                    constraint_name = f"{root_joint}_to_pelvis_parentConstraint"
-                                    if not cmds.objExists(constraint_name):
-                                        cmds.parentConstraint(pelvis_joint, root_joint, maintainOffset=True,
-                                                              name=constraint_name)
-                                        print(f"Created parent constraint from {pelvis_joint} to {root_joint}")
-
-                                # Unparent from current parent
-                                if current_parent:
-                                    cmds.parent(root_joint, world=True)
-
-                                # Parent to the chain group
-                                cmds.parent(root_joint, chain_grp)
-                                print(f"Moved {root_joint} chain to systems group")
-
-                            except Exception as e:
-                                print(f"Warning: Error moving {root_joint}: {str(e)}")
-
-                # STEP 4: Find the chest joint and set up connections for arms
-                chest_joint = None
-                chest_control = None
-                if spine_module:
-                    if "chest" in spine_module.joints:
-                        chest_joint = spine_module.joints["chest"]
-                    if "chest" in spine_module.controls:
-                        chest_control = spine_module.controls["chest"]
-                        print(f"Found chest control: {chest_control}")
-
-                    # STEP 4A: Connect arms to chest (binding joint chain and controls)
-                    if chest_joint and cmds.objExists(chest_joint) and chest_control and cmds.objExists(chest_control):
-                        # Find all arm modules (both left and right sides)
-                        arm_modules = [m for m in self.manager.modules.values() if
-                                       isinstance(m, LimbModule) and m.limb_type == "arm"]
-
-                        print(f"Found {len(arm_modules)} arm modules to connect")
-
-                        # Process each arm module individually for clarity
-                        for arm_module in arm_modules:
-                            print(f"\n=== PROCESSING ARM MODULE: {arm_module.module_id} (side: {arm_module.side}) ===")
-
-                            # DEBUGGING: Print all controls in the module
-                            print(f"Available controls in {arm_module.module_id}:")
-                            for control_name, control in arm_module.controls.items():
-                                print(f"  {control_name}: {control}")
-
-                            # IMPROVED: Check if clavicle control exists in the scene even if not in module
-                            expected_clavicle_ctrl_name = f"{arm_module.module_id}_clavicle_ctrl"
-
-                            # First check if it's in the module's controls
-                            if "clavicle" not in arm_module.controls:
-                                # Check if it exists in the scene anyway
-                                if cmds.objExists(expected_clavicle_ctrl_name):
-                                    print(f"Found existing clavicle control in scene: {expected_clavicle_ctrl_name}")
-                                    # Add it to the module's controls dictionary
-                                    arm_module.controls["clavicle"] = expected_clavicle_ctrl_name
-                                else:
-                                    print(
-                                        f"Clavicle control not found in scene or module: {expected_clavicle_ctrl_name}")
-
-                            # 1. CONNECT CLAVICLE JOINT TO CHEST JOINT
-                            if "clavicle" in arm_module.joints and cmds.objExists(arm_module.joints["clavicle"]):
-                                clavicle_joint = arm_module.joints["clavicle"]
-
-                                # Parent to chest if not already
-                                current_parent = cmds.listRelatives(clavicle_joint, parent=True)
-                                if not current_parent or current_parent[0] != chest_joint:
-                                    try:
-                                        cmds.parent(clavicle_joint, chest_joint)
-                                        print(
-                                            f"CONNECTED: Clavicle joint {clavicle_joint} -> chest joint {chest_joint}")
-                                    except Exception as e:
-                                        print(f"ERROR parenting clavicle joint: {str(e)}")
-                                else:
-                                    print(
-                                        f"Clavicle joint {clavicle_joint} already connected to chest joint {chest_joint}")
-
-                            # 2. CONNECT CLAVICLE CONTROL TO CHEST CONTROL
-                            if "clavicle" in arm_module.controls:
-                                clavicle_ctrl = arm_module.controls["clavicle"]
-                                clavicle_ctrl_grp = f"{clavicle_ctrl}_grp"
-
-                                if cmds.objExists(clavicle_ctrl) and cmds.objExists(clavicle_ctrl_grp):
-                                    # Parent to chest control if not already
-                                    current_parent = cmds.listRelatives(clavicle_ctrl_grp, parent=True)
-                                    if not current_parent or current_parent[0] != chest_control:
-                                        try:
-                                            cmds.parent(clavicle_ctrl_grp, chest_control)
-                                            print(
-                                                f"CONNECTED: Clavicle control group {clavicle_ctrl_grp} -> chest control {chest_control}")
-                                        except Exception as e:
-                                            print(f"ERROR parenting clavicle control: {str(e)}")
-                                    else:
-                                        print(
-                                            f"Clavicle control group {clavicle_ctrl_grp} already parented to chest control {chest_control}")
-
-                            # 3. CONNECT FK SHOULDER CONTROL TO CLAVICLE CONTROL - this is key for arm movement
-                            if "fk_shoulder" in arm_module.controls and "clavicle" in arm_module.controls:
-                                fk_shoulder_ctrl = arm_module.controls["fk_shoulder"]
-                                fk_shoulder_grp = f"{fk_shoulder_ctrl}_grp"
-                                clavicle_ctrl = arm_module.controls["clavicle"]
-
-                                if cmds.objExists(fk_shoulder_grp) and cmds.objExists(clavicle_ctrl):
-                                    # Check current parent
-                                    current_parent = cmds.listRelatives(fk_shoulder_grp, parent=True)
-                                    if not current_parent or current_parent[0] != clavicle_ctrl:
-                                        try:
-                                            cmds.parent(fk_shoulder_grp, clavicle_ctrl)
-                                            print(
-                                                f"CONNECTED: FK shoulder control group {fk_shoulder_grp} -> clavicle control {clavicle_ctrl}")
-                                        except Exception as e:
-                                            print(f"ERROR parenting FK shoulder control: {str(e)}")
-                                    else:
-                                        print(
-                                            f"FK shoulder control group {fk_shoulder_grp} already parented to clavicle control {clavicle_ctrl}")
-
-                            # 4. VERIFY AND RECREATE CLAVICLE CONSTRAINTS IF NEEDED
-                            if "clavicle" in arm_module.controls and "clavicle" in arm_module.joints:
-                                clavicle_ctrl = arm_module.controls["clavicle"]
-                                clavicle_joint = arm_module.joints["clavicle"]
-
-                                if cmds.objExists(clavicle_ctrl) and cmds.objExists(clavicle_joint):
-                                    # Check existing constraints
-                                    constraints = cmds.listConnections(clavicle_joint, source=True,
-                                                                       type="parentConstraint") or []
-
-                                    if not constraints:
-                                        print(f"No parent constraint found on {clavicle_joint}, creating one...")
-                                        cmds.parentConstraint(clavicle_ctrl, clavicle_joint, maintainOffset=True)
-                                        print(f"Created new constraint from {clavicle_ctrl} to {clavicle_joint}")
-
-                            # 5. MOVE IK/FK CHAINS TO SYSTEMS GROUP WITH PROPER CONSTRAINTS TO CLAVICLE
-                            for prefix in ["ik_", "fk_"]:
-                                root_key = f"{prefix}shoulder"
-                                if root_key in arm_module.joints and cmds.objExists(arm_module.joints[root_key]):
-                                    root_joint = arm_module.joints[root_key]
-                                    try:
-                                        # Create a subgroup for this chain
-                                        chain_grp = cmds.group(empty=True,
-                                                               name=f"{arm_module.module_id}_{prefix}chain_grp")
-                                        cmds.parent(chain_grp, systems_grp)
-
-                                        # Get current parent before unparenting
-                                        current_parent = cmds.listRelatives(root_joint, parent=True)
-
-                                        # CRITICAL FIX: Create constraint to clavicle BEFORE unparenting
-                                        # This ensures the IK shoulder still follows the clavicle even after moving
-                                        if prefix == "ik_" and "clavicle" in arm_module.joints:
-                                            constraint_name = f"{root_joint}_to_clavicle_parentConstraint"
-                                            if not cmds.objExists(constraint_name):
-                                                cmds.parentConstraint(
-                                                    arm_module.joints["clavicle"],
-                                                    root_joint,
-                                                    maintainOffset=True,
-                                                    name=constraint_name
-                                                )
-                                                print(f"Created parent constraint from clavicle to {root_joint}")
-
-                                        # Unparent from current parent
-                                        if current_parent:
-                                            cmds.parent(root_joint, world=True)
-
-                                        # Parent to the chain group
-                                        cmds.parent(root_joint, chain_grp)
-                                        print(f"Moved {root_joint} chain to systems group")
-
-                                        # Verify constraint is still working after reparenting
-                                        constraints = cmds.listConnections(root_joint, source=True,
-                                                                           type="parentConstraint") or []
-                                        if prefix == "ik_" and not constraints:
-                                            print(f"Warning: Constraint was lost, recreating for {root_joint}")
-                                            if "clavicle" in arm_module.joints:
-                                                cmds.parentConstraint(
-                                                    arm_module.joints["clavicle"],
-                                                    root_joint,
-                                                    maintainOffset=True
-                                                )
-                                                print(f"Recreated parent constraint from clavicle to {root_joint}")
-
-                                    except Exception as e:
-                                        print(f"Warning: Error moving {root_joint}: {str(e)}")
-
-                        # STEP 5: Connect neck base to chest
-                        if chest_joint and chest_control:
-                            neck_modules = [m for m in self.manager.modules.values() if isinstance(m, NeckModule)]
-
-                            for neck_module in neck_modules:
-                                # Check if neck_base exists
-                                if "neck_base" not in neck_module.joints:
-                                    print(f"Warning: Neck module has no neck_base joint")
-                                    continue
-
-                                # Get neck base joint
-                                neck_base_joint = neck_module.joints["neck_base"]
-
-                                # Verify joint is not already connected to chest
-                                current_parent = cmds.listRelatives(neck_base_joint, parent=True)
-                                if current_parent and current_parent[0] == chest_joint:
-                                    print(f"Neck base joint {neck_base_joint} already connected to chest {chest_joint}")
-                                else:
-                                    # Get all of the neck's children to maintain hierarchy
-                                    neck_children = cmds.listRelatives(neck_base_joint, children=True,
-                                                                       type="joint") or []
-
-                                    # Temporarily unparent children if any
-                                    for child in neck_children:
-                                        cmds.parent(child, world=True)
-
-                                    # Parent neck base to chest
-                                    cmds.parent(neck_base_joint, chest_joint)
-                                    print(f"Reparented {neck_base_joint} to {chest_joint}")
-
-                                    # Make sure the rotation values stay at zero
-                                    cmds.setAttr(f"{neck_base_joint}.rotate", 0, 0, 0)
-
-                                    # Reparent children back to neck_base
-                                    for child in neck_children:
-                                        cmds.parent(child, neck_base_joint)
-                                        print(f"  Restored child {child} to {neck_base_joint}")
-
-                                # Connect neck control to chest control
-                                if "neck_base" in neck_module.controls:
-                                    neck_base_ctrl = neck_module.controls["neck_base"]
-                                    neck_base_grp = f"{neck_base_ctrl}_grp"
-
-                                    if cmds.objExists(neck_base_grp):
-                                        # Check if already connected
-                                        current_parent = cmds.listRelatives(neck_base_grp, parent=True)
-                                        if not current_parent or current_parent[0] != chest_control:
-                                            try:
-                                                cmds.parent(neck_base_grp, chest_control)
-                                                print(
-                                                    f"Connected neck base control {neck_base_ctrl} to chest control {chest_control}")
-                                            except Exception as e:
-                                                print(f"Error connecting neck control: {str(e)}")
-
-                    # STEP 6: Connect head to the LAST neck joint (not first neck joint)
-                    head_modules = [m for m in self.manager.modules.values() if isinstance(m, HeadModule)]
-                    neck_modules = [m for m in self.manager.modules.values() if isinstance(m, NeckModule)]
-
-                    if head_modules and neck_modules:
-                        # Find a head module
-                        head_module = head_modules[0]
-
-                        # Find a neck module
-                        neck_module = neck_modules[0]
-
-                        # Get the LAST neck joint and control - IMPORTANT FIX
-                        last_neck_joint = None
-                        last_neck_control = None
-                        last_neck_name = f"neck_{neck_module.num_joints:02d}"
-
-                        if last_neck_name in neck_module.joints:
-                            last_neck_joint = neck_module.joints[last_neck_name]
-                            print(f"Found last neck joint: {last_neck_joint}")
-                        else:
-                            print(f"Warning: Last neck joint ({last_neck_name}) not found")
-                            # Find all neck joints and use the highest number
-                            neck_joints = []
-                            for i in range(1, 10):  # Check up to 10 neck joints
-                                key = f"neck_{i:02d}"
-                                if key in neck_module.joints:
-                                    neck_joints.append((i, neck_module.joints[key]))
-
-                            if neck_joints:
-                                # Use the highest numbered joint
-                                neck_joints.sort(reverse=True)
-                                last_neck_joint = neck_joints[0][1]
-                                print(f"Using highest neck joint found: {last_neck_joint}")
-
-                        # Find the last neck control (usually "top_neck")
-                        if "top_neck" in neck_module.controls:
-                            last_neck_control = neck_module.controls["top_neck"]
-                            print(f"Found last neck control: {last_neck_control}")
-
-                        # Check if head base exists and connect it to the LAST neck joint
-                        if "head_base" in head_module.joints and last_neck_joint and cmds.objExists(last_neck_joint):
-                            head_base_joint = head_module.joints["head_base"]
-                            print(f"Processing head joint: {head_base_joint}")
-
-                            # Save any head end joint first
-                            head_end_joint = None
-                            if "head_end" in head_module.joints:
-                                head_end_joint = head_module.joints["head_end"]
-                                # Temporarily parent to world
-                                if cmds.listRelatives(head_end_joint, parent=True):
-                                    cmds.parent(head_end_joint, world=True)
-                                    print(f"Temporarily unparented head end joint: {head_end_joint}")
-
-                            # Get current parent of head base
-                            current_parent = cmds.listRelatives(head_base_joint, parent=True)
-                            print(f"Current parent of head joint: {current_parent}")
-
-                            # IMPORTANT FIX: Explicitly connect head to the LAST neck joint
-                            if not current_parent or current_parent[0] != last_neck_joint:
-                                # First unparent
-                                if current_parent:
-                                    cmds.parent(head_base_joint, world=True)
-                                    print(f"Unparented head from {current_parent[0]}")
-
-                                # Now parent to last neck joint
-                                cmds.parent(head_base_joint, last_neck_joint)
-                                print(
-                                    f"FIXED: Connected head joint {head_base_joint} to LAST neck joint {last_neck_joint}")
-
-                                # Fix head orientation
-                                neck_orient = cmds.getAttr(f"{last_neck_joint}.jointOrient")[0]
-                                cmds.setAttr(f"{head_base_joint}.jointOrient", neck_orient[0], neck_orient[1],
-                                             neck_orient[2])
-                                cmds.setAttr(f"{head_base_joint}.rotate", 0, 0, 0)  # Zero out rotation
-
-                            # Reparent head_end back to head_base
-                            if head_end_joint and cmds.objExists(head_end_joint):
-                                cmds.parent(head_end_joint, head_base_joint)
-                                print(f"Restored head end joint to head base")
-
-                                # Fix orientation
-                                cmds.setAttr(f"{head_end_joint}.jointOrient", 0, 0, 0)
-                                cmds.setAttr(f"{head_end_joint}.rotate", 0, 0, 0)
-
-                            # Connect head control to last neck control
-                            if "head" in head_module.controls and last_neck_control:
-                                head_ctrl = head_module.controls["head"]
-                                head_ctrl_grp = f"{head_ctrl}_grp"
-
-                                if cmds.objExists(head_ctrl_grp):
-                                    current_parent = cmds.listRelatives(head_ctrl_grp, parent=True)
-                                    if not current_parent or current_parent[0] != last_neck_control:
-                                        try:
-                                            cmds.parent(head_ctrl_grp, last_neck_control)
-                                            print(
-                                                f"Connected head control {head_ctrl} to last neck control {last_neck_control}")
-                                        except Exception as e:
-                                            print(f"Error connecting head control: {str(e)}")
-
-                                    # Verify head constraint
-                                    if "head_base" in head_module.joints:
-                                        head_constraints = cmds.listConnections(head_module.joints["head_base"],
-                                                                                source=True,
-                                                                                type="parentConstraint") or []
-                                        if not head_constraints:
-                                            cmds.parentConstraint(head_ctrl, head_module.joints["head_base"],
-                                                                  maintainOffset=True)
-                                            print(f"Recreated constraint between head control and head joint")
-
-                    # STEP 7: Fix FK shoulder controls for both arms
-                    arm_modules = [m for m in self.manager.modules.values() if
-                                   isinstance(m, LimbModule) and m.limb_type == "arm"]
-
-                    for arm_module in arm_modules:
-                        print(f"\n=== FIXING FK SHOULDER CONSTRAINTS FOR {arm_module.module_id} ===")
-
-                        # Verify FK shoulder constraint
-                        if "fk_shoulder" in arm_module.controls and "fk_shoulder" in arm_module.joints:
-                            fk_ctrl = arm_module.controls["fk_shoulder"]
-                            fk_joint = arm_module.joints["fk_shoulder"]
-
-                            # Check if there's a constraint
-                            constraints = cmds.listConnections(fk_joint, source=True, destination=False,
-                                                               type="constraint") or []
-                            if not constraints:
-                                print(f"Adding missing constraint from {fk_ctrl} to {fk_joint}")
-                                try:
-                                    cmds.parentConstraint(fk_ctrl, fk_joint, maintainOffset=True)
-                                    print(f"Created new constraint from {fk_ctrl} to {fk_joint}")
-                                except Exception as e:
-                                    print(f"Error creating constraint: {str(e)}")
+                log.warning("ERROR parenting clavicle controls: %s", e)
+
+        # Current parents of the FK shoulder control groups, from one query
+        fk_shoulder_parents = self._parent_map(
+            [arm_module.get_control_group("fk_shoulder") for arm_module in arm_modules]
+        )
+
+        # Clavicle joints that already have a parent constraint, from one query
+        constrained_clavicles = self._constrained_nodes(
+            [arm_module.joints.get("clavicle") for arm_module in arm_modules
+             if arm_module.joints.get("clavicle") in existing],
+            "parentConstraint"
+        )
+
+        # Process each arm module individually for clarity
+        for arm_module in arm_modules:
+            log.debug("=== PROCESSING ARM MODULE: %s (side: %s) ===", arm_module.module_id, arm_module.side)
+
+            # Look up the nodes the steps below share once per arm
+            clavicle_ctrl = arm_module.controls.get("clavicle")
+            clavicle_joint = arm_module.joints.get("clavicle")
+            fk_shoulder_ctrl = arm_module.controls.get("fk_shoulder")
+
+            # 3. CONNECT FK SHOULDER CONTROL TO CLAVICLE CONTROL - this is key for arm movement
+            if fk_shoulder_ctrl and clavicle_ctrl:
+                fk_shoulder_grp = arm_module.get_control_group("fk_shoulder")
+
+                if fk_shoulder_grp in existing and clavicle_ctrl in existing:
+                    # Check current parent
+                    if fk_shoulder_parents.get(fk_shoulder_grp) != clavicle_ctrl:
+                        try:
+                            cmds.parent(fk_shoulder_grp, clavicle_ctrl)
+                            log.debug("CONNECTED: FK shoulder control group %s -> clavicle control %s", fk_shoulder_grp, clavicle_ctrl)
+                        except Exception as e:
+                            log.warning("ERROR parenting FK shoulder control: %s", e)
+                    else:
+                        log.debug("FK shoulder control group %s already parented to clavicle control %s", fk_shoulder_grp, clavicle_ctrl)
+
+            # 4. VERIFY AND RECREATE CLAVICLE CONSTRAINTS IF NEEDED
+            if clavicle_ctrl and clavicle_joint:
+                if clavicle_ctrl in existing and clavicle_joint in existing:
+                    # Check existing constraints
+                    if clavicle_joint not in constrained_clavicles:
+                        log.debug("No parent constraint found on %s, creating one...", clavicle_joint)
+                        cmds.parentConstraint(clavicle_ctrl, clavicle_joint, maintainOffset=True)
+                        log.debug("Created new constraint from %s to %s", clavicle_ctrl, clavicle_joint)
+
+            # 5. MOVE IK/FK CHAINS TO SYSTEMS GROUP WITH PROPER CONSTRAINTS TO CLAVICLE
+            for prefix, root_key in _ARM_CHAIN_ROOTS:
+                root_joint = arm_module.joints.get(root_key)
+                if root_joint and root_joint in existing:
+                    try:
+                        # Create a subgroup for this chain directly under the systems group
+                        chain_grp = cmds.createNode(
+                            "transform",
+                            parent=systems_grp,
+                            name=f"{arm_module.module_id}_{prefix}chain_grp"
+                        )
+
+                        # CRITICAL FIX: Create constraint to clavicle BEFORE unparenting
+                        # This ensures the IK shoulder still follows the clavicle even after moving
+                        if prefix == "ik_" and clavicle_joint:
+                            constraint_name = f"{root_joint}_to_clavicle_parentConstraint"
+                            if constraint_name not in existing:
+                                cmds.parentConstraint(
+                                    clavicle_joint,
+                                    root_joint,
+                                    maintainOffset=True,
+                                    name=constraint_name
+                                )
+                                log.debug("Created parent constraint from clavicle to %s", root_joint)
+
+                        # Parent to the chain group, cmds.parent keeps the world transform
+                        cmds.parent(root_joint, chain_grp)
+                        log.debug("Moved %s chain to systems group", root_joint)
+
+                        # Verify the IK constraint is still working after reparenting
+                        if prefix == "ik_" and not cmds.listConnections(root_joint, source=True,
+                                                                        type="parentConstraint"):
+                            log.warning("Constraint was lost, recreating for %s", root_joint)
+                            if clavicle_joint:
+                                cmds.parentConstraint(
+                                    clavicle_joint,
+                                    root_joint,
+                                    maintainOffset=True
+                                )
+                                log.debug("Recreated parent constraint from clavicle to %s", root_joint)
+
+                    except Exception as e:
+                        log.warning("Error moving %s: %s", root_joint, e)
+
+    def _root_step_neck(self, ctx):
+        """
+        STEP 5: Connect the neck base joint and control to the chest.
+
+        Args:
+            ctx (dict): State shared by the add_root_joint steps, see _build_root_hierarchy
+        """
+        existing = ctx["existing"]
+        chest_joint = ctx["chest_joint"]
+        chest_control = ctx["chest_control"]
+        neck_modules = ctx["neck_modules"]
+
+        # Current parents of the neck base joints and control groups, from one query
+        neck_parents = self._parent_map(
+            [neck_module.joints.get("neck_base") for neck_module in neck_modules] +
+            [neck_module.get_control_group("neck_base") for neck_module in neck_modules]
+        )
+        for neck_module in neck_modules:
+            # Check if neck_base exists
+            if "neck_base" not in neck_module.joints:
+                log.warning("Neck module has no neck_base joint")
+                continue
+
+            # Get neck base joint
+            neck_base_joint = neck_module.joints["neck_base"]
+
+            # Verify joint is not already connected to chest
+            if neck_parents.get(neck_base_joint) == chest_joint:
+                log.debug("Neck base joint %s already connected to chest %s", neck_base_joint, chest_joint)
+            else:
+                # Get all of the neck's children to maintain hierarchy
+                neck_children = cmds.listRelatives(neck_base_joint, children=True,
+                                                   type="joint") or []
+
+                # Temporarily unparent children if any
+                for child in neck_children:
+                    cmds.parent(child, world=True)
+
+                # Parent neck base to chest
+                cmds.parent(neck_base_joint, chest_joint)
+                log.debug("Reparented %s to %s", neck_base_joint, chest_joint)
+
+                # Make sure the rotation values stay at zero
+                cmds.setAttr(f"{neck_base_joint}.rotate", 0, 0, 0)
+
+                # Reparent children back to neck_base
+                for child in neck_children:
+                    cmds.parent(child, neck_base_joint)
+                    log.debug("  Restored child %s to %s", child, neck_base_joint)
+
+            # Connect neck control to chest control
+            if "neck_base" in neck_module.controls:
+                neck_base_ctrl = neck_module.controls["neck_base"]
+                neck_base_grp = neck_module.get_control_group("neck_base")
+
+                if neck_base_grp in existing:
+                    # Check if already connected
+                    if neck_parents.get(neck_base_grp) != chest_control:
+                        try:
+                            cmds.parent(neck_base_grp, chest_control)
+                            log.debug("Connected neck base control %s to chest control %s", neck_base_ctrl, chest_control)
+                        except Exception as e:
+                            log.warning("Error connecting neck control: %s", e)
+
+    def _root_step_head(self, ctx):
+        """
+        STEP 6: Connect the head to the LAST neck joint (not the first neck joint).
+
+        Args:
+            ctx (dict): State shared by the add_root_joint steps, see _build_root_hierarchy
+        """
+        existing = ctx["existing"]
+        neck_modules = ctx["neck_modules"]
+        head_modules = ctx["head_modules"]
+
+        # Find a head module
+        head_module = head_modules[0]
+
+        # Find a neck module
+        neck_module = neck_modules[0]
+
+        # Get the LAST neck joint and control - IMPORTANT FIX
+        last_neck_joint = None
+        last_neck_control = None
+        last_neck_name = f"neck_{neck_module.num_joints:02d}"
+
+        if last_neck_name in neck_module.joints:
+            last_neck_joint = neck_module.joints[last_neck_name]
+            log.debug("Found last neck joint: %s", last_neck_joint)
+        else:
+            log.warning("Last neck joint (%s) not found", last_neck_name)
+            # Use the highest numbered neck joint the module has ("neck_01", "neck_02", ...)
+            neck_keys = [key for key in neck_module.joints
+                         if key.startswith("neck_") and key[5:].isdigit()]
+            if neck_keys:
+                last_neck_key = max(neck_keys, key=lambda key: int(key[5:]))
+                last_neck_joint = neck_module.joints[last_neck_key]
+                log.debug("Using highest neck joint found: %s", last_neck_joint)
+
+        # Find the last neck control (usually "top_neck")
+        if "top_neck" in neck_module.controls:
+            last_neck_control = neck_module.controls["top_neck"]
+            log.debug("Found last neck control: %s", last_neck_control)
+
+        # Check if head base exists and connect it to the LAST neck joint
+        if "head_base" in head_module.joints and last_neck_joint and last_neck_joint in existing:
+            head_base_joint = head_module.joints["head_base"]
+            log.debug("Processing head joint: %s", head_base_joint)
+
+            # Current parents of the head joints and control group, from one query
+            head_parents = self._parent_map([
+                head_base_joint,
+                head_module.joints.get("head_end"),
+                head_module.get_control_group("head"),
+            ])
+
+            # Save any head end joint first
+            head_end_joint = None
+            if "head_end" in head_module.joints:
+                head_end_joint = head_module.joints["head_end"]
+                # Temporarily parent to world
+                if head_parents.get(head_end_joint):
+                    cmds.parent(head_end_joint, world=True)
+                    log.debug("Temporarily unparented head end joint: %s", head_end_joint)
+
+            # Get current parent of head base
+            current_parent = head_parents.get(head_base_joint)
+            log.debug("Current parent of head joint: %s", current_parent)
+
+            # IMPORTANT FIX: Explicitly connect head to the LAST neck joint
+            if current_parent != last_neck_joint:
+                # Parent straight to the last neck joint, cmds.parent keeps the world
+                # transform so there is no need to go through the world first
+                cmds.parent(head_base_joint, last_neck_joint)
+                log.debug("FIXED: Connected head joint %s to LAST neck joint %s", head_base_joint, last_neck_joint)
+
+                # Fix head orientation
+                neck_orient = cmds.getAttr(f"{last_neck_joint}.jointOrient")[0]
+                cmds.setAttr(f"{head_base_joint}.jointOrient", neck_orient[0], neck_orient[1],
+                             neck_orient[2])
+                cmds.setAttr(f"{head_base_joint}.rotate", 0, 0, 0)  # Zero out rotation
+
+            # Reparent head_end back to head_base
+            if head_end_joint and head_end_joint in existing:
+                cmds.parent(head_end_joint, head_base_joint)
+                log.debug("Restored head end joint to head base")
+
+                # Fix orientation
+                cmds.setAttr(f"{head_end_joint}.jointOrient", 0, 0, 0)
+                cmds.setAttr(f"{head_end_joint}.rotate", 0, 0, 0)
+
+            # Connect head control to last neck control
+            if "head" in head_module.controls and last_neck_control:
+                head_ctrl = head_module.controls["head"]
+                head_ctrl_grp = head_module.get_control_group("head")
+
+                if head_ctrl_grp in existing:
+                    if head_parents.get(head_ctrl_grp) != last_neck_control:
+                        try:
+                            cmds.parent(head_ctrl_grp, last_neck_control)
+                            log.debug("Connected head control %s to last neck control %s", head_ctrl, last_neck_control)
+                        except Exception as e:
+                            log.warning("Error connecting head control: %s", e)
+
+                    # Verify head constraint
+                    head_constraints = cmds.listConnections(head_base_joint, source=True,
+                                                            type="parentConstraint") or []
+                    if not head_constraints:
+                        cmds.parentConstraint(head_ctrl, head_base_joint, maintainOffset=True)
+                        log.debug("Recreated constraint between head control and head joint")
+
+    def _root_step_fk_shoulders(self, ctx):
+        """
+        STEP 7: Recreate missing FK shoulder constraints for both arms.
 
+        Args:
+            ctx (dict): State shared by the add_root_joint steps, see _build_root_hierarchy
+        """
+        existing = ctx["existing"]
+        arm_modules = ctx["arm_modules"]
+
+        # FK shoulder joints already driven by a constraint, from one query
+        constrained_fk_shoulders = self._constrained_nodes(
+            [arm_module.joints.get("fk_shoulder") for arm_module in arm_modules
+             if arm_module.joints.get("fk_shoulder") in existing],
+            "constraint",
+            destination=False
+        )
+        for arm_module in arm_modules:
+            log.debug("=== FIXING FK SHOULDER CONSTRAINTS FOR %s ===", arm_module.module_id)
+
+            # Verify FK shoulder constraint
+            if "fk_shoulder" in arm_module.controls and "fk_shoulder" in arm_module.joints:
+                fk_ctrl = arm_module.controls["fk_shoulder"]
+                fk_joint = arm_module.joints["fk_shoulder"]
+
+                # Check if there's a constraint
+                if fk_joint not in constrained_fk_shoulders:
+                    log.debug("Adding missing constraint from %s to %s", fk_ctrl, fk_joint)
                     try:
-                        # STEP 8: Organize clusters
-                        self.manager.organize_clusters()
+                        cmds.parentConstraint(fk_ctrl, fk_joint, maintainOffset=True)
+                        log.debug("Created new constraint from %s to %s", fk_ctrl, fk_joint)
                     except Exception as e:
-                        print(f"Warning: Error organizing clusters: {str(e)}")
+                        log.warning("Error creating constraint: %s", e)
+
+    def _root_step_clusters(self, ctx):
+        """
+        STEP 8: Organize the clusters under the rig.
 
-                    QtWidgets.QMessageBox.information(self, "Success", "Root joint created and hierarchy organized.")
+        Args:
+            ctx (dict): State shared by the add_root_joint steps, see _build_root_hierarchy
+        """
+        try:
+            self.manager.organize_clusters()
+        except Exception as e:
+            log.warning("Error organizing clusters: %s", e)
+
+    def _existing_nodes(self, names):
+        """
+        Return the subset of names that exist in the scene using one cmds.ls call.
 
+        Args:
+            names (list): Node names or partial DAG paths to check, empty entries are ignored
+
+        Returns:
+            set: The requested names that exist, exactly as they were passed in
+        """
+        names = [name for name in names if name]
+        if not names:
+            # cmds.ls with an empty list would return every node in the scene
+            return set()
+
+        # cmds.ls returns a path instead of the short name for nodes whose name is not
+        # unique, so map the long paths it finds back to the names that were asked for
+        paths_by_leaf = {}
+        for path in cmds.ls(names, long=True) or []:
+            paths_by_leaf.setdefault(path.rsplit("|", 1)[-1], []).append(path)
+
+        existing = set()
+        for name in names:
+            paths = paths_by_leaf.get(name.rsplit("|", 1)[-1])
+            if not paths:
+                continue
+            if "|" not in name:
+                existing.add(name)
+            else:
+                suffix = "|" + name.lstrip("|")
+                if any(path.endswith(suffix) for path in paths):
+                    existing.add(name)
+        return existing
+
+    def _parent_map(self, names):
+        """
+        Look up the current parent of several DAG nodes with a single cmds.ls call.
+
+        Args:
+            names (list): Node names, names that do not exist are left out
+
+        Returns:
+            dict: Node name to parent name, None for nodes parented to the world
+        """
+        names = [name for name in names if name]
+        if not names:
+            # cmds.ls with an empty list would return every node in the scene
+            return {}
+
+        # A full path ends in "|parent|node", or "|node" for a child of the world
+        parents = {}
+        for path in cmds.ls(names, long=True) or []:
+            parent_path, _, node = path.rpartition("|")
+            parents[node] = parent_path.rpartition("|")[2] or None
+        return parents
+
+    def _constrained_nodes(self, names, constraint_type, destination=True):
+        """
+        Find which of several nodes are connected to a constraint with a single listConnections call.
+
+        Args:
+            names (list): Existing node names to check
+            constraint_type (str): Node type of the constraint, e.g. 'parentConstraint'
+            destination (bool): Also count constraints the nodes drive, not only ones driving them
+
+        Returns:
+            set: Names connected to a constraint of that type
+        """
+        if not names:
+            return set()
+
+        # With connections=True the result alternates (plug on the queried node, connected node)
+        connections = cmds.listConnections(names, source=True, destination=destination,
+                                           type=constraint_type, connections=True) or []
+        return {plug.split(".", 1)[0] for plug in connections[::2]}
+
+    def _module_node_names(self):
+        """
+        Collect the joint, control and control group names of all registered modules.
+
+        Returns:
+            list: Node names, including the expected clavicle control and IK chain
+                constraint of each limb
+        """
+        names = []
+        for module in self.manager.modules.values():
+            names.extend(module.joints.values())
+            for key, control in module.controls.items():
+                names.append(control)
+                names.append(module.get_control_group(key))
+            if module.module_type in ("arm", "leg"):
+                names.append(f"{module.module_id}_clavicle_ctrl")
+                names.append(f"{module.module_id}_clavicle_ctrl_grp")
+                ik_root = module.joints.get("ik_hip" if module.module_type == "leg" else "ik_shoulder")
+                if ik_root:
+                    target = "pelvis" if module.module_type == "leg" else "clavicle"
+                    names.append(f"{ik_root}_to_{target}_parentConstraint")
+            if hasattr(module, 'utility_nodes') and 'pole_viz_curve' in module.utility_nodes:
+                names.append(module.utility_nodes['pole_viz_curve'])
+        return names
+
+    @QtCore.Slot()
     def cleanup_scene(self):
         """
         Perform a comprehensive scene cleanup.
         Removes empty groups, unnecessary nodes, and helps organize the Maya scene.
         """
-        # Confirm with user
-        result = QtWidgets.QMessageBox.question(
-            self,
+        self._ask(
             "Cleanup Scene",
             "This will remove empty groups and help organize the scene. Continue?",
-            QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No
+            self._run_cleanup_scene
         )
 
-        if result == QtWidgets.QMessageBox.Yes:
-            # 1. Remove Empty Groups
-            empty_groups = self._find_empty_nulls()
-            delete_count = self._delete_empty_nulls(empty_groups)
-
-            # Show results
-            QtWidgets.QMessageBox.information(
-                self,
-                "Cleanup Complete",
-                f"Cleanup Results:\n"
-                f"- Removed {delete_count} empty groups\n"
-            )
+    def _run_cleanup_scene(self):
+        """Remove empty groups once the cleanup has been confirmed."""
+        self._show_status("Cleaning up scene...", repaint=True)
+
+        # Cleanup only removes empty nulls, so running it again gives the same result.
+        # When undo is turned off the deletes skip the undo queue without flushing it.
+        keep_undo = self.cleanup_undo_checkbox.isChecked()
+        undo_state = cmds.undoInfo(query=True, state=True)
+        if not keep_undo:
+            cmds.undoInfo(stateWithoutFlush=False)
+        try:
+            # 1. Remove Empty Groups, as one undo step with the scene evaluated once at the end
+            with self._scene_edit("autorig_cleanup_scene", pause_evaluation=True), maintained_selection():
+                empty_groups = self._find_empty_nulls()
+                delete_count = self._delete_empty_nulls(empty_groups)
+        finally:
+            if not keep_undo:
+                cmds.undoInfo(stateWithoutFlush=undo_state)
+
+        # Show results
+        self._info(
+            f"Cleanup Results:\n"
+            f"- Removed {delete_count} empty groups\n",
+            title="Cleanup Complete"
+        )
 
     def _find_empty_nulls(self):
         """
@@ -1046,33 +1775,28 @@ class ModularRigUI(QtWidgets.QDialog):
         Returns:
             list: Names of empty null transform nodes
         """
-        # Get all transform nodes
-        nulls = cmds.ls(type='transform')
-
         # List to store empty nulls
         empty_nulls = []
 
-        for null in nulls:
-            # Skip if node doesn't exist
-            if not cmds.objExists(null):
-                continue
-
-            # Check if the node has no children and is a transform
-            if not cmds.listRelatives(null, children=True) and cmds.nodeType(null) == 'transform':
-                # Exclude Maya's default objects and groups
-                if null.startswith("|"):
-                    continue
-
-                # Exclude specific Maya system groups
-                if any(reserved in null for reserved in [
-                    "persp", "top", "front", "side",
-                    "defaultLayer", "LayerManager"
-                ]):
-                    continue
-
-                empty_nulls.append(null)
-
-        return empty_nulls
+        # Walk the DAG once through the API, which reports the type and child count of
+        # each transform directly instead of through per-node commands. The kTransform
+        # filter also yields derived types (joints, constraints...), so the exact
+        # type is checked below.
+        dag_it = om.MItDag(om.MItDag.kDepthFirst, om.MFn.kTransform)
+        while not dag_it.isDone():
+            dag_path = dag_it.getPath()
+            # Check if the node is a plain transform with no children
+            if dag_path.apiType() == om.MFn.kTransform and dag_path.childCount() == 0:
+                null = dag_path.partialPathName()
+
+                # Exclude Maya's default objects and groups, nodes whose name is not
+                # unique and specific Maya system groups
+                if not null.startswith("|") and not _RESERVED_NULL_RE.search(null):
+                    empty_nulls.append(null)
+            dag_it.next()
+
+        # An instanced transform is visited once per instance path
+        return list(dict.fromkeys(empty_nulls))
 
     def _delete_empty_nulls(self, nulls_to_delete):
         """
@@ -1084,27 +1808,47 @@ class ModularRigUI(QtWidgets.QDialog):
         Returns:
             int: Number of nulls deleted
         """
-        delete_count = 0
-        for null in nulls_to_delete:
-            try:
-                if cmds.objExists(null):
-                    # Final check to ensure it's still an empty transform
-                    if not cmds.listRelatives(null, children=True) and cmds.nodeType(null) == 'transform':
-                        cmds.delete(null)
-                        delete_count += 1
-                        print(f"Deleted empty null: {null}")
-            except Exception as e:
-                print(f"Error deleting null {null}: {str(e)}")
+        # Drop nodes that no longer exist with one cmds.ls call instead of an objExists per node.
+        # The nulls come from _find_empty_nulls in the same scene edit, so they are not re-checked.
+        nulls = sorted(self._existing_nodes(nulls_to_delete))
+        if not nulls:
+            log.info("Deleted 0 empty nulls")
+            return 0
+
+        try:
+            cmds.delete(nulls)
+            delete_count = len(nulls)
+        except Exception as e:
+            # Fall back to smaller batches so one bad node does not keep the rest
+            log.warning("Error deleting empty nulls in one batch, retrying in chunks: %s", e)
+            delete_count = 0
+            for start in range(0, len(nulls), _DELETE_CHUNK_SIZE):
+                chunk = list(self._existing_nodes(nulls[start:start + _DELETE_CHUNK_SIZE]))
+                try:
+                    if chunk:
+                        cmds.delete(chunk)
+                        delete_count += len(chunk)
+                except Exception as e:
+                    log.warning("Error deleting nulls %s: %s", ", ".join(chunk), e)
 
+        log.info("Deleted %d empty nulls", delete_count)
         return delete_count
 
 def show_ui():
     """Show the UI, ensuring only one instance exists."""
+    global _CURRENT_DIALOG
+
     # Check if window already exists and delete it
     window_name = "ModularRigUI"
     if cmds.window(window_name, exists=True):
         cmds.deleteUI(window_name)
 
+    # Release the previous dialog's widget tree instead of waiting on GC
+    if _CURRENT_DIALOG is not None:
+        if shiboken2.isValid(_CURRENT_DIALOG):
+            _CURRENT_DIALOG.deleteLater()
+        _CURRENT_DIALOG = None
+
     # Create and show new dialog
     dialog = ModularRigUI()
     dialog.setObjectName(window_name)
@@ -1112,6 +1856,7 @@ def show_ui():
     dialog.setWindowTitle("Modular Rig System")
     dialog.show()
 
+    _CURRENT_DIALOG = dialog
     return dialog
 
 if __name__ == "__main__":